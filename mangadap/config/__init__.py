@@ -17,14 +17,12 @@ def get_manga_environ():
                'MANGACORE_DIR': os.path.join(os.getcwd(), 'MaNGA', 'core', _MANGACORE_VER)}
 
     # Replace with variables from working environment if they exist
-    for key in environ.keys():
-        if key in os.environ:
-            environ[key] = os.environ[key]
+    for key, default in environ.items():
+        environ[key] = os.environ.get(key, default)
 
-    environ['sdss-access'] = os.environ['SDSS_ACCESS_DIR'].split('/')[-1] \
-                                if 'SDSS_ACCESS_DIR' in os.environ else None
-    environ['idlutils'] = os.environ['IDLUTILS_DIR'].split('/')[-1] \
-                            if 'IDLUTILS_DIR' in os.environ else None
+    for key, env in zip(['sdss-access', 'idlutils'], ['SDSS_ACCESS_DIR', 'IDLUTILS_DIR']):
+        path = os.environ.get(env)
+        environ[key] = None if path is None else path.split('/')[-1]
 
     return environ
 
@@ -53,5 +51,10 @@ def get_python_versions():
     versions['mangadap'] = version
     return versions
 
-python_versions = get_python_versions()
+def __getattr__(name):
+    # Only import all the dependencies when their versions are requested.
+    if name == 'python_versions':
+        globals()[name] = get_python_versions()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
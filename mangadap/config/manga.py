@@ -13,6 +13,7 @@ Class defining the I/O configuration for MaNGA files in the DAP.
 """
 import time
 import warnings
+from functools import lru_cache
 from pathlib import Path
 from configparser import ConfigParser
 
@@ -28,6 +29,27 @@ from ..util.parser import DefaultConfig
 from ..util.constants import DAPConstants
 from ..util.filter import interpolate_masked_vector
 
+
+@lru_cache(maxsize=None)
+def _environ_path(key):
+    """
+    Return the resolved path defined by one of the DAP environmental
+    variables.
+
+    The environment is only read once (see
+    :func:`mangadap.config.get_manga_environ`), so the resolved path is
+    cached to avoid repeated filesystem queries.
+
+    Args:
+        key (:obj:`str`):
+            Environmental variable with the path.
+
+    Returns:
+        `Path`_: Resolved path.
+    """
+    return Path(manga_environ[key]).resolve()
+
+
 def drp_version():
     """
     Return the DRP version defined by the environmental variable
@@ -51,7 +73,7 @@ def drp_redux_path(drpver=None):
     # Make sure the DRP version is set
     if drpver is None:
         drpver = drp_version()
-    return Path(manga_environ['MANGA_SPECTRO_REDUX']).resolve() / drpver
+    return _environ_path('MANGA_SPECTRO_REDUX') / drpver
 
 
 def drp_directory_path(plate, drpver=None, redux_path=None):
@@ -74,7 +96,7 @@ def drp_directory_path(plate, drpver=None, redux_path=None):
     # Make sure the redux path is set
     _redux_path = drp_redux_path(drpver=drpver) \
                         if redux_path is None else Path(redux_path).resolve()
-    return _redux_path / str(plate) / 'stack'
+    return _redux_path.joinpath(str(plate), 'stack')
 
 
 def drp_finding_chart_path(plate, drpver=None, redux_path=None):
@@ -96,7 +118,7 @@ def drp_finding_chart_path(plate, drpver=None, redux_path=None):
     # Make sure the redux path is set
     _redux_path = drp_redux_path(drpver=drpver) \
                         if redux_path is None else Path(redux_path).resolve()
-    return _redux_path / str(plate) / 'images'
+    return _redux_path.joinpath(str(plate), 'images')
 
 
 def drpall_file(drpver=None, redux_path=None):
@@ -148,7 +170,11 @@ def dap_analysis_path(drpver=None, dapver=None):
     # Make sure the DAP version is set
     if dapver is None:
         dapver = dap_version()
-    return Path(manga_environ['MANGA_SPECTRO_ANALYSIS']).resolve() / drpver / dapver
+    return _environ_path('MANGA_SPECTRO_ANALYSIS').joinpath(drpver, dapver)
+
+
+# Allowed modes for the MaNGA fits file names
+_manga_fits_modes = (None, 'LINCUBE', 'LINRSS', 'LOGCUBE', 'LOGRSS', 'MAPS')
 
 
 def manga_fits_root(plate, ifudesign, mode=None):
@@ -174,9 +200,11 @@ def manga_fits_root(plate, ifudesign, mode=None):
         ValueError:
             Raised if mode is not a valid option.
     """
-    if mode not in [ None, 'LINCUBE', 'LINRSS', 'LOGCUBE', 'LOGRSS', 'MAPS' ]:
-        raise ValueError('Do not understand mode={0}.'.format(mode))
-    return f'manga-{plate}-{ifudesign}' if mode is None else f'manga-{plate}-{ifudesign}-{mode}'
+    if mode not in _manga_fits_modes:
+        raise ValueError(f'Do not understand mode={mode}.')
+    if mode is None:
+        return f'manga-{plate}-{ifudesign}'
+    return f'manga-{plate}-{ifudesign}-{mode}'
 
 
 def plate_target_files():
@@ -193,21 +221,19 @@ def plate_target_files():
         string, the second provides the integer catalog index
         determined for each file.
     """
-    core_dir = Path(manga_environ['MANGACORE_DIR']).resolve()
+    core_dir = _environ_path('MANGACORE_DIR')
     if not core_dir.exists():
         raise ValueError(f'MANGACORE directory does not exist! {core_dir}')
 
     # Default search string
-    search_str =  core_dir / 'platedesign' / 'platetargets'
-    file_list = sorted(list(search_path.glob('plateTargets*.par')))
+    search_path = core_dir.joinpath('platedesign', 'platetargets')
+    file_list = sorted(search_path.glob('plateTargets*.par'))
     nfiles = len(file_list)
     if nfiles == 0:
         raise ValueError('Unable to find any plateTargets files!')
-    trgid = numpy.zeros(nfiles, dtype=int)                  # Array to hold indices
-    for i in range(nfiles):
-        suffix = file_list[i].split('-')[1]                 # Strip out the '{i}.par'
-        trgid[i] = int(suffix[:suffix.find('.')])           # Strip out '{i}'
-    
+    # Strip the '{i}' out of each 'plateTargets-{i}.par' file name
+    trgid = numpy.fromiter((int(f.name.rpartition('-')[2].partition('.')[0]) for f in file_list),
+                           dtype=int, count=nfiles)
     return numpy.array(file_list), trgid
 
 
@@ -743,7 +769,8 @@ class MaNGAAnalysisPlan(AnalysisPlan):
         if self.cube is None:
             raise ValueError('Path undefined because cube being processed was not provided '
                              'when MaNGAAnalysisPlan was instantiated!')
-        return self.analysis_path / 'common' / str(self.cube.plate) / str(self.cube.ifudesign)
+        return self.analysis_path.joinpath('common', str(self.cube.plate),
+                                          str(self.cube.ifudesign))
 
     def method_path(self, plan_index=0, qa=False, ref=False):
         """
@@ -778,8 +805,8 @@ class MaNGAAnalysisPlan(AnalysisPlan):
         if qa and ref:
             raise ValueError('Cannot provide path for both qa and ref directory.  Pick one.')
 
-        root = self.analysis_path / self.plan[self.plan_keys[plan_index]]['key'] \
-                    / str(self.cube.plate) / str(self.cube.ifudesign)
+        root = self.analysis_path.joinpath(self.plan[self.plan_keys[plan_index]]['key'],
+                                           str(self.cube.plate), str(self.cube.ifudesign))
         if not qa and not ref:
             return root
         if qa:
@@ -139,8 +139,11 @@ def ppxf_tied_parameters(component, vgrp, sgrp, moments):
     if sgrp is not None and len(sgrp) != ntpl:
         raise ValueError('Must provided a sigma group for each template.')
 
+    # Index of the first parameter of each component
+    par_start = np.append(0, np.cumsum(np.absolute(moments)))
+
     # Build the tied parameters as a vector
-    tied = np.full(np.sum(np.absolute(moments)), '', dtype=object)
+    tied = np.full(par_start[-1], '', dtype=object)
     tpli = np.arange(ntpl)
     for i in range(ncomp):
         # Do not allow tying to fixed components?
@@ -151,14 +154,14 @@ def ppxf_tied_parameters(component, vgrp, sgrp, moments):
         if vgrp is not None:
             indx = np.unique(component[tpli[vgrp == i]])
             if len(indx) > 1:
-                parn = [ 0 + np.sum(np.absolute(moments[:j])) for j in indx ]
+                parn = par_start[indx]
                 tied[parn[1:]] = 'p[{0}]'.format(parn[0])
             
         # Sigma group of this component
         if sgrp is not None:
             indx = np.unique(component[tpli[sgrp == i]])
             if len(indx) > 1:
-                parn = [ 1 + np.sum(np.absolute(moments[:j])) for j in indx ]
+                parn = 1 + par_start[indx]
                 tied[parn[1:]] = 'p[{0}]'.format(parn[0])
 
     # Check if anything is actually tied
@@ -166,8 +169,7 @@ def ppxf_tied_parameters(component, vgrp, sgrp, moments):
         return None
 
     # Return after restructuring the vector into a list
-    s = [np.sum(np.absolute(moments[:i])) for i in range(ncomp)]
-    return [tied[s[i]:s[i]+np.absolute(moments[i])].tolist() for i in range(ncomp)]
+    return [tied[par_start[i]:par_start[i+1]].tolist() for i in range(ncomp)]
 
 
 def calculate_noise(residuals, width=101):
@@ -822,15 +824,27 @@ def _fit_iteration(tpl_wave, templates, wave, flux, noise, velscale, start, mome
         fault[:starting_spectrum] = True
     #-------------------------------------------------------------------
 
+    # The parameter tying object only depends on which templates are
+    # valid, so construct it once for each unique set of valid templates
+    tied_cache = {}
+    def _tied(valid_templates, _component, _vgrp, _sgrp, _moments):
+        key = valid_templates.tobytes()
+        if key not in tied_cache:
+            tied_cache[key] = ppxf_tied_parameters(_component, _vgrp, _sgrp, _moments)
+        return tied_cache[key]
+
     #-------------------------------------------------------------------
     # Fit each spectrum individually
+    last_report = 0.
     for i in range(starting_spectrum, nspec):
         if not np.any(model_mask[i,ps[i]:pe[i]]):
             # Nothing to fit!
             continue
 
-        # Report progress
-        print('Fitting spectrum: {0}/{1}'.format(i+1,nspec), end='\r')
+        # Report progress, at most twice per second
+        if time.monotonic() - last_report > 0.5:
+            print(f'Fitting spectrum: {i+1}/{nspec}', end='\r')
+            last_report = time.monotonic()
 
         # Confirm that all templates and components are valid and
         # rearrange component arrays, if necessary
@@ -843,7 +857,7 @@ def _fit_iteration(tpl_wave, templates, wave, flux, noise, velscale, start, mome
                                                          vsyst=vsyst[i], constr_kinem=constr_kinem)
 
         # Construct the parameter tying structure
-        tied = ppxf_tied_parameters(_component, _vgrp, _sgrp, _moments)
+        tied = _tied(valid_templates, _component, _vgrp, _sgrp, _moments)
 
         # Run the first fit.
         # NOTE: lsq_box is the default in ppxf 7.4.0, so no need to
@@ -909,7 +923,7 @@ def _fit_iteration(tpl_wave, templates, wave, flux, noise, velscale, start, mome
                                                              constr_kinem=constr_kinem)
 
             # Construct the parameter tying structure
-            tied = ppxf_tied_parameters(_component, _vgrp, _sgrp, _moments)
+            tied = _tied(valid_templates, _component, _vgrp, _sgrp, _moments)
 
             # Refit using best-fit kinematics from previous fit as
             # initial guesses
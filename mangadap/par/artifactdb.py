@@ -22,8 +22,6 @@ spectra in an RSS or CUBE file.
 import os
 import numpy
 
-from pydl.goddard.astro import airtovac
-from pydl.pydlutils.yanny import yanny
 from .parset import KeywordParSet, ParDatabase
 from .spectralfeaturedb import SpectralFeatureDB
 
@@ -109,17 +107,28 @@ class ArtifactDB(SpectralFeatureDB):
             :class:`mangadap.par.parset.ParSet` instances for each
             line of the database.
         """
+        # pydl is only needed here, so only import it when the file is parsed
+        from pydl.goddard.astro import airtovac
+        from pydl.pydlutils.yanny import yanny
+
         # Read the yanny file
         par = yanny(filename=self.file, raw=True)
         if len(par['DAPART']['index']) == 0:
             raise ValueError('Could not find DAPART entries in {0}!'.format(self.file))
 
-        # Setup the array of emission line database parameters
+        # Collect the columns of the database
         self.size = len(par['DAPART']['index'])
-        parlist = []
-        for i in range(self.size):
-            invac = par['DAPART']['waveref'][i] == 'vac'
-            parlist += [ ArtifactPar(index=par['DAPART']['index'][i], name=par['DAPART']['name'][i],
-                                     waverange=numpy.asarray(par['DAPART']['waverange'][i]) \
-                                      if invac else airtovac(par['DAPEML']['waverange'][i]) )]
-        return parlist
+        index = par['DAPART']['index']
+        name = par['DAPART']['name']
+        waverange = numpy.asarray(par['DAPART']['waverange'], dtype=float)
+        # Check all the wavelength ranges at once
+        if waverange.shape != (self.size, 2):
+            raise ValueError('Wavelength range must have two and only two elements.')
+        # Convert all the air wavelengths to vacuum in a single call
+        inair = numpy.asarray(par['DAPART']['waveref']) != 'vac'
+        if numpy.any(inair):
+            waverange[inair] = airtovac(waverange[inair])
+
+        # Setup the array of artifact database parameters
+        return [ArtifactPar(index=index[i], name=name[i], waverange=waverange[i])
+                    for i in range(self.size)]
@@ -292,8 +292,8 @@ class EmissionLineDB(SpectralFeatureDB):
         """
         tie_indx = numpy.full(self.data['tie_index'].shape, -1, dtype=int)
         indx = self.data['tie_index'] > 0
-        tie_indx[indx] = [numpy.where(self.data['index'] == i)[0][0]
-                            for i in self.data['tie_index'][indx]]
+        row = {index: i for i, index in enumerate(self.data['index'])}
+        tie_indx[indx] = [row[i] for i in self.data['tie_index'][indx]]
         return tie_indx
 
     @property
@@ -25,8 +25,6 @@ from IPython import embed
 
 import numpy
 
-from pydl.pydlutils.yanny import yanny
-
 from ..config import defaults
 from .parset import ParDatabase
 from ..util.parser import DefaultConfig
@@ -39,8 +39,6 @@ import numpy
 from ..par.parset import KeywordParSet
 from ..util.sampling import grid_borders
 
-from matplotlib import pyplot
-
 # Add strict versioning
 # from distutils.version import StrictVersion
 
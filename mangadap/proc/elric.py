@@ -710,8 +710,8 @@ class Elric(EmissionLineFit):
             profile_set = numpy.array([ lineprofiles.NCompLineProfile(
                                         self.emission_lines['ncomp'][primary_line][i],
                                         par=self.emission_lines['par'][primary_line][i],
-                                        profile=eval('lineprofiles.'
-                                            +self.emission_lines['profile'][primary_line][i])) ])
+                                        profile=getattr(lineprofiles,
+                                            self.emission_lines['profile'][primary_line][i])) ])
             fixed_par = self.emission_lines['fix'][primary_line][i].astype(bool).reshape(1,-1)
             bounds = numpy.array([ [l,u] \
                                     for l,u in zip(self.emission_lines['lobnd'][primary_line][i],
@@ -747,8 +747,8 @@ class Elric(EmissionLineFit):
             self.fitting_window[base_indx].append(i, e['index'], e['restwave'],
                                                   lineprofiles.NCompLineProfile(e['ncomp'],
                                                                                 par=e['par'],
-                                                                   profile=eval('lineprofiles.'
-                                                                                +e['profile'])),
+                                                                   profile=getattr(lineprofiles,
+                                                                                   e['profile'])),
                                                   e['fix'],
                     numpy.array([ [l,u] for l,u in zip(e['lobnd'], e['hibnd']) ]).reshape(-1,2),
                                                   e['log_bnd'], bool(e['output_model']))
@@ -42,7 +42,6 @@ import logging
 from IPython import embed
 
 import numpy
-from scipy import interpolate
 
 import astropy.constants
 
@@ -52,9 +51,6 @@ from ..util.misc import is_number
 from ..util import lineprofiles
 from .spectralfitting import EmissionLineFit
 
-# For debugging
-from matplotlib import pyplot
-
 
 class EmissionLineTemplates:
     r"""
@@ -125,9 +121,6 @@ class EmissionLineTemplates:
         wave (`numpy.ndarray`_):
             Array with the wavelength (angstroms) of each pixel for all
             the constructed templates.  Shape is :math:`(N_{\rm pix},)`.
-        sigma_inst (`scipy.interpolate.interp1d`_):
-            The object used to interpolate the instrumental dispersion
-            (km/s) at the rest wavelength of each spectral line.
         log (:obj:`bool`):
             Flag that the spectrum is sampled geometrically.
         base (:obj:`float`):
@@ -162,6 +155,12 @@ class EmissionLineTemplates:
             velocity dispersion parameters tied in pPXF, but the
             velocity parameters are independent.  Shape is
             :math:`(N_{\rm tpl},)`.
+        ncomp (:obj:`int`):
+            Number of kinematic components.
+        nvgrp (:obj:`int`):
+            Number of velocity groups.
+        nsgrp (:obj:`int`):
+            Number of sigma groups.
         A_ineq (`numpy.ndarray`_):
             A matrix used to constrain the kinematic parameters between
             kinematic components. See the ``constr_kinem`` for pPXF (version
@@ -201,8 +200,7 @@ class EmissionLineTemplates:
         if _sinst.shape != self.wave.shape:
             raise ValueError('Provided sigma_inst must be a single number or a vector with the'
                              'same length as the wavelength vector.')
-        self.sigma_inst = interpolate.interp1d(self.wave, _sinst, assume_sorted=True,
-                                               bounds_error=False, fill_value=0)
+        self._sinst = _sinst
         self.log = log
         self.base = base
 
@@ -215,6 +213,9 @@ class EmissionLineTemplates:
         self.comp = None            # Kinematic component associated with each template
         self.vgrp = None            # Velocity group associated with each template
         self.sgrp = None            # Sigma group associated with each template
+        self.ncomp = None           # Number of kinematic components
+        self.nvgrp = None           # Number of velocity groups
+        self.nsgrp = None           # Number of sigma groups
         self.tie_comp_lb = None     # Fractional lower bound on each kinematic component
         self.tie_comp_ub = None     # Fractional upper bound on each kinematic component
         self.A_ineq = None          # Linear inequality constraint matrix for the kinematics
@@ -351,69 +352,81 @@ class EmissionLineTemplates:
         self.vgrp[:nref] = numpy.arange(nref)
         self.sgrp[:nref] = numpy.arange(nref)
 
-        finished = numpy.tile(ref_line | ignore_line, (3,1)).T
-
+        # Get the lines that each line depends on: either the one line it is
+        # entirely tied to, or the lines its velocity and velocity dispersion
+        # are tied to.
         tied_indx = self.emldb.tie_index_match()
-        while numpy.sum(finished) != 3*self.emldb.size:
-            # Find the indices of lines that are tied to finished lines
-            start_sum = numpy.sum(finished)
-            for i in range(self.emldb.size):
-                if numpy.all(finished[i]):
-                    continue
-
-                # All properties of this line are to be equal to the same line
-                # such that the line will be part of an existing template
-                if numpy.all(tied_indx[i] == tied_indx[i,0]) and numpy.all(tie_eq[i]):
-                    if not numpy.all(finished[tied_indx[i,0]]):
-                        continue
-                    finished[i,:] = True
-                    self.tpli[i] = self.tpli[tied_indx[i,0]]
-                    continue
-
-                # Otherwise, the line propertied are either tied to different
-                # lines or they're not all tied to be equal.  Get the indices of
-                # the tied lines.  Only need to do so for the velocity and
-                # velocity dispersion.
-
-                # Get the tied line indices for the velocity and velocity dispersion
-                if (tied_indx[i,1] >= 0 and not finished[tied_indx[i,1],1]) \
-                        or (tied_indx[i,2] >= 0 and not finished[tied_indx[i,2],2]):
-                    continue
-
-                finished[i,:] = True
-                self.tpli[i] = numpy.amax(self.tpli)+1
+        same_tpl = tied_all & numpy.all(tied_indx == tied_indx[:,:1], axis=1)
+        depends = [tied_indx[i,:1] if same_tpl[i] else tied_indx[i,1:][tied_indx[i,1:] >= 0]
+                    for i in range(self.emldb.size)]
+
+        # Determine the order in which to parse the remaining lines.  This
+        # parses the lines in the order they would be found by repeatedly
+        # sweeping through the database: a line is parsed in the first sweep
+        # where all the lines it depends on have already been parsed, either
+        # in a previous sweep or earlier in the same sweep.  Lines in
+        # circular ties cannot be parsed.
+        sweep = numpy.where(ref_line | ignore_line, 0, -1)
+
+        def _sweep(i):
+            if sweep[i] == -2:
+                raise ValueError('Unable to parse the input database due to an error in the '
+                                 'database/file.  Check the tying parameters.')
+            if sweep[i] < 0:
+                sweep[i] = -2
+                sweep[i] = max([1] + [_sweep(j) + int(j > i) for j in depends[i]])
+            return sweep[i]
+
+        for i in range(self.emldb.size):
+            _sweep(i)
+        order = numpy.argsort(sweep, kind='stable')[nref + numpy.sum(ignore_line):]
+
+        # Running number of templates, kinematic components, velocity groups,
+        # and sigma groups
+        ntpl = ncomp = nvgrp = nsgrp = nref
+        for i in order:
+            # All properties of this line are to be equal to the same line
+            # such that the line will be part of an existing template
+            if same_tpl[i]:
+                self.tpli[i] = self.tpli[tied_indx[i,0]]
+                continue
 
-                if numpy.all(tied_indx[i,1:] >= 0) and tied_indx[i,1] == tied_indx[i,2] \
-                        and numpy.all(tie_eq[i,1:]):
-                    # Line is part of a new template but uses existing kinematic components
-                    self.comp[self.tpli[i]] = self.comp[self.tpli[tied_indx[i,1]]]
-                    self.vgrp[self.tpli[i]] = self.vgrp[self.tpli[tied_indx[i,1]]]
-                    self.sgrp[self.tpli[i]] = self.sgrp[self.tpli[tied_indx[i,1]]]
-                    continue
+            # Otherwise, the line propertied are either tied to different
+            # lines or they're not all tied to be equal.
+            self.tpli[i] = ntpl
+            ntpl += 1
+
+            if numpy.all(tied_indx[i,1:] >= 0) and tied_indx[i,1] == tied_indx[i,2] \
+                    and numpy.all(tie_eq[i,1:]):
+                # Line is part of a new template but uses existing kinematic components
+                self.comp[self.tpli[i]] = self.comp[self.tpli[tied_indx[i,1]]]
+                self.vgrp[self.tpli[i]] = self.vgrp[self.tpli[tied_indx[i,1]]]
+                self.sgrp[self.tpli[i]] = self.sgrp[self.tpli[tied_indx[i,1]]]
+                continue
 
-                self.comp[self.tpli[i]] = numpy.amax(self.comp)+1
+            self.comp[self.tpli[i]] = ncomp
+            ncomp += 1
 
-                if tied_indx[i,1] >= 0 and tie_eq[i,1]:
-                    self.vgrp[self.tpli[i]] = self.vgrp[self.tpli[tied_indx[i,1]]]
-                else:
-                    self.vgrp[self.tpli[i]] = numpy.amax(self.vgrp)+1
+            if tied_indx[i,1] >= 0 and tie_eq[i,1]:
+                self.vgrp[self.tpli[i]] = self.vgrp[self.tpli[tied_indx[i,1]]]
+            else:
+                self.vgrp[self.tpli[i]] = nvgrp
+                nvgrp += 1
 
-                if tied_indx[i,2] >= 0 and tie_eq[i,2]:
-                    self.sgrp[self.tpli[i]] = self.sgrp[self.tpli[tied_indx[i,2]]]
-                else:
-                    self.sgrp[self.tpli[i]] = numpy.amax(self.sgrp)+1
+            if tied_indx[i,2] >= 0 and tie_eq[i,2]:
+                self.sgrp[self.tpli[i]] = self.sgrp[self.tpli[tied_indx[i,2]]]
+            else:
+                self.sgrp[self.tpli[i]] = nsgrp
+                nsgrp += 1
 
-            # If the loop ends up with the same number of parsed lines
-            # that it started with, there must be an error in the
-            # construction of the input database.
-            if start_sum == numpy.sum(finished):
-                raise ValueError('Unable to parse the input database due to an error in the '
-                                 'database/file.  Check the tying parameters.')
+        # Save the number of components and groups
+        self.ncomp, self.nvgrp, self.nsgrp = ncomp, nvgrp, nsgrp
 
         # All templates must have an assigned component, velocity group and
         # dispersion group. Otherwise, something has gone wrong or the input
         # database hasn't been constructed correctly.
-        if numpy.any(self.comp < 0) or numpy.any(self.vgrp < 0) or numpy.any(self.sgrp < 0):
+        if ntpl != self.ntpl or numpy.any(self.comp < 0) or numpy.any(self.vgrp < 0) \
+                or numpy.any(self.sgrp < 0):
             raise ValueError('One or more templates were not assigned to a kinematic component.  '
                              'Check for errors in the input database/file.')
 
@@ -442,7 +455,7 @@ class EmissionLineTemplates:
         # constraints.
         # TODO: I'm not actually sure that it's possible for this to fault, but
         # it's here just in case.
-        ncomp = numpy.amax(self.comp)+1
+        ncomp = self.ncomp
         # The kinematic component assigned to each line
         compi = numpy.full(self.emldb.size, -1, dtype=int)
         indx = numpy.logical_not(ignore_line)
@@ -542,12 +555,29 @@ class EmissionLineTemplates:
                     self.A_ineq[constr,2*i+j] = 1.
                     constr += 1
 
+    def sigma_inst(self, wave):
+        """
+        Linearly interpolate the instrumental dispersion (km/s) at the
+        provided wavelengths.
+
+        Args:
+            wave (array-like):
+                Wavelengths at which to interpolate the instrumental
+                dispersion.
+
+        Returns:
+            `numpy.ndarray`_: Instrumental dispersion at each
+            wavelength.  Wavelengths outside the range of :attr:`wave`
+            are given a dispersion of 0.
+        """
+        return numpy.interp(wave, self.wave, self._sinst, left=0., right=0.)
+
     def build_templates(self, emldb, flux_density=True, profile='FFTGaussianLSF', loggers=None,
                         quiet=False):
         r"""
         Build the set of templates for a given emission-line database.
         The function uses the current values in :attr:`wave` and
-        :attr:`sigma_inst`.  Any existing templates from a previous call
+        :func:`sigma_inst`.  Any existing templates from a previous call
         to :func:`build_templates` or from the object instantiation will
         be overwritten using the provided emission-line database.
 
@@ -612,17 +642,14 @@ class EmissionLineTemplates:
             log_output(self.loggers, 1, logging.INFO,
                        'Number of emission-line templates: {0}'.format(len(self.comp)))
             log_output(self.loggers, 1, logging.INFO,
-                       'Number of emission-line kinematic components: {0}'.format(
-                                                                    numpy.amax(self.comp)+1))
+                       'Number of emission-line kinematic components: {0}'.format(self.ncomp))
             log_output(self.loggers, 1, logging.INFO,
                        'Number of emission-line kinematic constraints: {0}'.format(
                                                 0 if self.b_ineq is None else self.b_ineq.size))
             log_output(self.loggers, 1, logging.INFO,
-                       'Number of emission-line velocity groups: {0}'.format(
-                                                                    numpy.amax(self.vgrp)+1))
+                       'Number of emission-line velocity groups: {0}'.format(self.nvgrp))
             log_output(self.loggers, 1, logging.INFO,
-                       'Number of emission-line sigma groups: {0}'.format(
-                                                                    numpy.amax(self.sgrp)+1))
+                       'Number of emission-line sigma groups: {0}'.format(self.nsgrp))
 
         # Get the instrumental dispersion at the center of each line
         self.eml_sigma_inst = self.sigma_inst(self.emldb['restwave'])
@@ -645,19 +672,15 @@ class EmissionLineTemplates:
                         / astropy.constants.c.to('km/s').value / dl
 
         # Construct the templates
-        _profile = eval('lineprofiles.'+profile)()  # Declare an instance of the desired profile
+        _profile = getattr(lineprofiles, profile)()  # Declare an instance of the desired profile
         pix = numpy.arange(self.wave.size)
         self.flux = numpy.zeros((self.ntpl,self.wave.size), dtype=float)
-        for i in range(self.ntpl):
-            # Find all the lines associated with this template:
-            index = numpy.arange(self.emldb.size)[self.tpli == i]
-            # Add each line to the template
-            for j in index:
-                # Use the first three moments of the line to set the
-                # parameters
-                p = _profile.parameters_from_moments(_flux[j], _restwave[j], _sigma[j])
-                # Add the line to the flux in this template
-                self.flux[i,:] += _profile(pix, p)
+        # Only construct the lines included in a template
+        indx = self.tpli > -1
+        # Use the first three moments of the lines to set the parameters
+        p = _profile.parameters_from_moments(_flux[indx], _restwave[indx], _sigma[indx])
+        # Sample all the lines at once and add each to its template
+        numpy.add.at(self.flux, self.tpli[indx], _profile(pix, p))
 
         return self.flux, self.comp, self.vgrp, self.sgrp, self.A_ineq, self.b_ineq
 
@@ -699,10 +722,8 @@ class EmissionLineTemplates:
             2)`.
         """
         _guess_kin = numpy.asarray(guess_kin)
-        if _guess_kin.ndim == 2:
-            start = numpy.tile(guess_kin, (ncomp,1,1)).transpose(1,0,2)
-        else:
-            start = numpy.expand_dims(numpy.tile(guess_kin, (ncomp,1)), 0)
+        # Replicate the guess for each component
+        start = numpy.repeat(numpy.atleast_2d(_guess_kin)[:,None,:], ncomp, axis=1)
         if A_ineq is None:
             # There are no inequality constraints, so simply repeat the guess
             # for each component.
@@ -20,12 +20,14 @@ Implements a wrapper class for pPXF.
 .. include:: ../include/links.rst
 """
 import inspect
+import time
 import warnings
 import logging
 
 from IPython import embed
 
 import numpy
+from scipy import fft
 #from scipy import interpolate, fftpack
 from matplotlib import pyplot
 
@@ -681,7 +683,7 @@ class PPXFFit(StellarKinematicsFit):
         else:
             _usetpl = usetpl.astype(bool)
             if _usetpl.shape == (ntpl,):
-                _usetpl = numpy.array([_usetpl]*nobj)
+                _usetpl = numpy.tile(_usetpl, (nobj,1))
         return _usetpl
 
     @staticmethod
@@ -723,7 +725,7 @@ class PPXFFit(StellarKinematicsFit):
         _waverange[numpy.equal(_waverange[:,0], None),0] = obj_wave[0]-1
         _waverange[numpy.equal(_waverange[:,1], None),1] = obj_wave[-1]+1
         if _waverange.shape[0] == 1:
-            _waverange = numpy.array([_waverange[0,:]]*nobj)
+            _waverange = numpy.tile(_waverange[0,:], (nobj,1))
         if _waverange.shape != (nobj,2):
             raise ValueError('Input wavelength range array does not have the correct shape.')
         return _waverange
@@ -770,8 +772,7 @@ class PPXFFit(StellarKinematicsFit):
                                                    velocity_offset=velocity_offset)
 
         # Include the masked object pixels
-        model_mask[obj_flux.mask] = True if bitmask is None else \
-                                        bitmask.turn_on(model_mask[obj_flux.mask], 'DIDNOTUSE')
+        model_mask[obj_flux.mask] |= True if bitmask is None else bitmask.bit_value('DIDNOTUSE')
 
         # Assess the regions that need to be masked during fitting
         if ensemble:
@@ -791,10 +792,10 @@ class PPXFFit(StellarKinematicsFit):
                 return model_mask, numpy.array([e]*nobj), numpy.zeros(nobj, dtype=int), \
                             numpy.array([obj_flux.shape[1]]*nobj).astype(int)
 
-            fit_indx = numpy.array([ fit_indx ]*nobj)
-            waverange_mask = numpy.array([ waverange_mask ]*nobj)
-            npix_mask = numpy.array([ npix_mask ]*nobj)
-            alias_mask = numpy.array([ alias_mask ]*nobj)
+            fit_indx = numpy.tile(fit_indx, (nobj,1))
+            waverange_mask = numpy.tile(waverange_mask, (nobj,1))
+            npix_mask = numpy.tile(npix_mask, (nobj,1))
+            alias_mask = numpy.tile(alias_mask, (nobj,1))
         else:
             # Treat all spectra independently, such that the masks are
             # independent
@@ -804,7 +805,7 @@ class PPXFFit(StellarKinematicsFit):
             alias_mask = numpy.zeros(obj_flux.shape, dtype=bool)
             _velocity_offset = numpy.asarray(velocity_offset) \
                                         if isinstance(velocity_offset,(list,numpy.ndarray)) \
-                                        else numpy.array([velocity_offset]*nobj)
+                                        else numpy.full(nobj, velocity_offset)
             if len(_velocity_offset) != nobj:
                 raise ValueError('Incorrect number of velocity offsets provided.')
             for i in range(nobj):
@@ -826,16 +827,14 @@ class PPXFFit(StellarKinematicsFit):
             model_mask[npix_mask] = True
             model_mask[alias_mask] = True
         else:
-            model_mask[waverange_mask] = bitmask.turn_on(model_mask[waverange_mask],
-                                                         PPXFFit.rng_flag)
-            model_mask[npix_mask] = bitmask.turn_on(model_mask[npix_mask], PPXFFit.tpl_flag)
-            model_mask[alias_mask] = bitmask.turn_on(model_mask[alias_mask], PPXFFit.trunc_flag)
+            model_mask[waverange_mask] |= bitmask.bit_value(PPXFFit.rng_flag)
+            model_mask[npix_mask] |= bitmask.bit_value(PPXFFit.tpl_flag)
+            model_mask[alias_mask] |= bitmask.bit_value(PPXFFit.trunc_flag)
 
         # Make sure that the errors are valid
         indx = numpy.invert(obj_ferr.data > 0) | numpy.invert(numpy.isfinite(obj_ferr.data))
         if numpy.sum(indx) > 0:
-            model_mask[indx] = True if bitmask is None else\
-                                    bitmask.turn_on(model_mask[indx], 'INVALID_ERROR')
+            model_mask[indx] |= True if bitmask is None else bitmask.bit_value('INVALID_ERROR')
         # To avoid having pPXF throw an exception, make sure that all
         # of these bad errors are set to unity
         obj_ferr[indx] = 1.0
@@ -847,14 +846,15 @@ class PPXFFit(StellarKinematicsFit):
         # Determine the starting and ending pixels and return
         # TODO: does this work if all the pixels are masked in a given
         # spectrum?
-        pix = numpy.ma.MaskedArray(numpy.array([numpy.arange(obj_flux.shape[1])]*nobj),
+        pix = numpy.ma.MaskedArray(numpy.broadcast_to(numpy.arange(obj_flux.shape[1]),
+                                                      obj_flux.shape),
                                    mask=numpy.invert(fit_indx))
         return model_mask, err, numpy.ma.amin(pix, axis=1), numpy.ma.amax(pix, axis=1)+1
 
     def _run_fit_iteration(self, obj_flux, obj_ferr, start, end, base_velocity, tpl_flux,
                            tpl_rfft, guess_kin, fix_kinematics=False, obj_to_fit=None,
                            tpl_to_use=None, degree=None, mdegree=None, dof=None,
-                           weight_errors=False, plot=False):
+                           weight_errors=False, plot=False, tpl_subsets=None):
         r"""
         Fit all the object spectra in obj_flux.
 
@@ -898,6 +898,11 @@ class PPXFFit(StellarKinematicsFit):
             dof (int): (**Optional**) Number of degrees of freedom in
                 the fit.  Default is to use the internal attribute
                 :attr:`dof`.
+            tpl_subsets (dict): (**Optional**) Cache with the template
+                subsets used by the fits; see :func:`_template_subset`.
+                The cache is filled as the spectra are fit and can be
+                shared between fit iterations that use the same
+                templates.  If None, a new cache is used.
 
         Returns:
             numpy.ndarray : Array with :math:`N_{\rm spec}` instances of
@@ -908,6 +913,11 @@ class PPXFFit(StellarKinematicsFit):
         _obj_to_fit = numpy.ones(nspec, dtype=bool) if obj_to_fit is None else obj_to_fit
         ntpl = tpl_flux.shape[0]
         _tpl_to_use = numpy.ones((nspec,ntpl), dtype=bool) if tpl_to_use is None else tpl_to_use
+        _tpl_subsets = {} if tpl_subsets is None else tpl_subsets
+        # Number of templates used by each spectrum
+        ntpl_to_use = numpy.sum(_tpl_to_use, axis=1)
+        # Pixels that can be fit in all spectra
+        obj_gpm = numpy.logical_not(numpy.ma.getmaskarray(obj_flux))
 
 #        input_kin = self.guess_kin if fixed_kin is None else fixed_kin
         moments = -self.moments if fix_kinematics else self.moments
@@ -924,22 +934,25 @@ class PPXFFit(StellarKinematicsFit):
 #        plot=True
 
         # Fit each spectrum
+        last_report = 0.
         for i in range(nspec):
-            print('Running pPXF fit on spectrum: {0}/{1}'.format(i+1,nspec), end='\r')
+            # Limit the progress report to twice per second
+            if time.monotonic() - last_report > 0.5:
+                print(f'Running pPXF fit on spectrum: {i+1}/{nspec}', end='\r')
+                last_report = time.monotonic()
             # Meant to ignore this spectrum
             if not _obj_to_fit[i]:
                 result[i] = None
                 continue
 
             # Get the pixels to fit for this spectrum
-            gpm = numpy.where(numpy.invert(obj_flux.mask[i,start[i]:end[i]]))[0]
+            gpm = numpy.flatnonzero(obj_gpm[i,start[i]:end[i]])
 
             # Check if there is sufficient data for the fit
-            ntpl_to_use = numpy.sum(_tpl_to_use[i,:])
-            if len(gpm) < dof+ntpl_to_use:
+            if len(gpm) < dof+ntpl_to_use[i]:
                 if not self.quiet:
                     warnings.warn('Insufficient data points ({0}) to fit spectrum {1}'
-                                  '(dof={2}).'.format(len(gpm), i+1, dof+ntpl_to_use))
+                                  '(dof={2}).'.format(len(gpm), i+1, dof+ntpl_to_use[i]))
                 result[i] = PPXFFitResult(degree, mdegree, start[i], end[i], _tpl_to_use[i,:],
                                           None, ntpl)
                 continue
@@ -947,15 +960,17 @@ class PPXFFit(StellarKinematicsFit):
             # Run ppxf
             if plot:
                 pyplot.clf()
+            _tpl_flux, _tpl_rfft = PPXFFit._template_subset(tpl_flux, tpl_rfft, _tpl_to_use[i],
+                                                            _tpl_subsets)
             result[i] = PPXFFitResult(degree, mdegree, start[i], end[i], _tpl_to_use[i,:],
-                            ppxf.ppxf(tpl_flux[tpl_to_use[i,:],:].T,
+                            ppxf.ppxf(_tpl_flux,
                                       obj_flux.data[i,start[i]:end[i]],
                                       obj_ferr.data[i,start[i]:end[i]], self.velscale,
                                       guess_kin[i,:], velscale_ratio=self.velscale_ratio,
                                       goodpixels=gpm, bias=self.bias, degree=degree,
                                       mdegree=mdegree, moments=moments, vsyst=-base_velocity[i],
                                       quiet=(not plot), plot=plot, linear=linear,
-                                      templates_rfft=tpl_rfft[tpl_to_use[i,:],:].T), ntpl,
+                                      templates_rfft=_tpl_rfft), ntpl,
                                       weight_errors=weight_errors)
 #                                      linear_method='lsqlin'), ntpl,
 #                                      weight_errors=weight_errors)
@@ -991,6 +1006,45 @@ class PPXFFit(StellarKinematicsFit):
         print('Running pPXF fit on spectrum: {0}/{1}'.format(nspec,nspec))
         return result
 
+    @staticmethod
+    def _template_subset(tpl_flux, tpl_rfft, tpl_to_use, cache=None, maxsize=10):
+        r"""
+        Select the subset of templates used in the fit to a single
+        spectrum.
+
+        Spectra that use the same templates can share the same subset
+        by providing a cache, such that the templates only need to be
+        selected and transposed once.  To limit the memory used, no
+        more than ``maxsize`` subsets are kept in the cache; subsets
+        beyond this are selected anew for each spectrum.
+
+        Args:
+            tpl_flux (array): Size is :math:`N_{\rm tpl}\times N_{\rm
+                tpl chan}`, template spectra
+            tpl_rfft (array): Size is :math:`N_{\rm tpl}\times N_{\rm
+                tpl pad}`, real FFT of the template spectra
+            tpl_to_use (array): Size is :math:`N_{\rm tpl}`, boolean
+                flag to use a template for the fit
+            cache (dict): (**Optional**) Cache of previously selected
+                subsets, keyed by the bytes of ``tpl_to_use``.  The
+                cache is edited in place.
+            maxsize (int): (**Optional**) Maximum number of subsets to
+                keep in the cache.
+
+        Returns:
+            :obj:`tuple`: The transposed template flux and FFT arrays,
+            as passed to pPXF.
+        """
+        if cache is None:
+            return tpl_flux[tpl_to_use].T, tpl_rfft[tpl_to_use].T
+        key = tpl_to_use.tobytes()
+        if key in cache:
+            return cache[key]
+        subset = (tpl_flux[tpl_to_use].T, tpl_rfft[tpl_to_use].T)
+        if len(cache) < maxsize:
+            cache[key] = subset
+        return subset
+
     def _fit_global_spectrum(self, obj_to_include=None, plot=False):
         """
         Fit the global spectrum.  This:
@@ -1110,13 +1164,16 @@ class PPXFFit(StellarKinematicsFit):
                        'Number of object spectra to fit: {0}/{1}'.format(
                             numpy.sum(self.obj_to_fit), len(self.obj_to_fit)))
 
+        # Share the selected template subsets between fit iterations
+        tpl_subsets = {}
+
         result = self._run_fit_iteration(self.obj_flux, self.obj_ferr, self.spectrum_start,
                                          self.spectrum_end, self.base_velocity, templates,
                                          templates_rfft, self.guess_kin,
                                          fix_kinematics=self.fix_kinematics,
                                          obj_to_fit=self.obj_to_fit, tpl_to_use=tpl_to_use,
                                          weight_errors=not self._mode_includes_rejection(),
-                                         plot=plot)
+                                         plot=plot, tpl_subsets=tpl_subsets)
         if not self._mode_includes_rejection():
             # Only a single fit so return
             return result
@@ -1150,7 +1207,7 @@ class PPXFFit(StellarKinematicsFit):
                                        templates_rfft, self.guess_kin,
                                        fix_kinematics=self.fix_kinematics,
                                        obj_to_fit=obj_to_fit, tpl_to_use=tpl_to_use,
-                                       weight_errors=True, plot=plot)
+                                       weight_errors=True, plot=plot, tpl_subsets=tpl_subsets)
 
     def _fit_dispersion_correction(self, templates, templates_rfft, result,
                                    baseline_dispersion=None):
@@ -1354,56 +1411,56 @@ class PPXFFit(StellarKinematicsFit):
             return 0., True
         return numpy.sqrt(mean_fwhm_sqr_diff)/DAPConstants.sig2fwhm, False
 
-    def _is_near_bounds(self, result, guess_velocity, tol_frac=1e-2):
-        """
+    def _is_near_bounds(self, kin, guess_velocity, tol_frac=1e-2):
+        r"""
         Check if the fitted kinematics are near the imposed limits.
         
         The definition of "near" is that the velocity and higher moments
         cannot be closer than the provided fraction of the total width
         to the boundary.  For the velocity dispersion, the fraction is
         done in log space.
-        """
 
-        near_bounds = numpy.zeros(self.moments, dtype=bool)
-        near_lower_sigma_bound = False
+        Args:
+            kin (numpy.ndarray): Best-fitting kinematics for all the
+                spectra to check.  Shape is :math:`(N_{\rm
+                spec},N_{\rm moments})`.
+            guess_velocity (numpy.ndarray): The guess velocity for
+                each spectrum, which sets the offset of the velocity
+                limits.  Shape is :math:`(N_{\rm spec},)`.
+            tol_frac (float): (**Optional**) The fractional tolerance
+                for classifying the parameter as near the boundary.
 
-        # Velocity
-        _velocity_limits = self.velocity_limits + guess_velocity
-        Dv = numpy.diff(_velocity_limits)[0]
-        tol = Dv*tol_frac
+        Returns:
+            numpy.ndarray: Two boolean arrays that flag if (1) each
+            parameter is near either boundary, with shape
+            :math:`(N_{\rm spec},N_{\rm moments})`, and (2) the
+            velocity dispersion is near the lower boundary, with shape
+            :math:`(N_{\rm spec},)`.
+        """
+        near_bounds = numpy.zeros(kin.shape, dtype=bool)
 
-        near_bounds[0] = result.kin[0]-_velocity_limits[0] < tol \
-                            or _velocity_limits[1]-result.kin[0] < tol
+        # Velocity
+        _velocity_limits = self.velocity_limits[None,:] + guess_velocity[:,None]
+        tol = (_velocity_limits[:,1] - _velocity_limits[:,0])*tol_frac
+        near_bounds[:,0] = (kin[:,0] - _velocity_limits[:,0] < tol) \
+                                | (_velocity_limits[:,1] - kin[:,0] < tol)
 
         # Velocity dispersion
         Ds = numpy.diff(numpy.log10(self.sigma_limits))[0]
         tol = Ds*tol_frac
-
-        near_lower_sigma_bound \
-                = numpy.log10(result.kin[1]) - numpy.log10(self.sigma_limits[0]) < tol
-        near_bounds[1] = near_lower_sigma_bound \
-                        or numpy.log10(self.sigma_limits[1]) - numpy.log10(result.kin[1]) < tol
+        log_sigma = numpy.log10(kin[:,1])
+        near_lower_sigma_bound = log_sigma - numpy.log10(self.sigma_limits[0]) < tol
+        near_bounds[:,1] = near_lower_sigma_bound \
+                                | (numpy.log10(self.sigma_limits[1]) - log_sigma < tol)
 
         if self.moments == 2:
             return near_bounds, near_lower_sigma_bound
 
-        # H3 and H4
-        Dh = numpy.diff(self.gh_limits)
+        # Higher order moments
+        Dh = numpy.diff(self.gh_limits)[0]
         tol = Dh*tol_frac
-        near_bounds[2] = result.kin[2] - self.gh_limits[0] < tol \
-                                or self.gh_limits[1] - result.kin[2] < tol
-        near_bounds[3] = result.kin[3] - self.gh_limits[0] < tol \
-                                or self.gh_limits[1] - result.kin[3] < tol
-        
-        if self.moments == 4:
-            return near_bounds, near_lower_sigma_bound
-
-        # H5 and H6
-        near_bounds[4] = result.kin[4] - self.gh_limits[0] < tol \
-                                or self.gh_limits[1] - result.kin[4] < tol
-        near_bounds[5] = result.kin[5] - self.gh_limits[0] < tol \
-                                or self.gh_limits[1] - result.kin[5] < tol
-
+        near_bounds[:,2:] = (kin[:,2:] - self.gh_limits[0] < tol) \
+                                | (self.gh_limits[1] - kin[:,2:] < tol)
         return near_bounds, near_lower_sigma_bound
 
 #    def _set_and_report_failed_status(self, model_mask, model_par, message):
@@ -1420,11 +1477,12 @@ class PPXFFit(StellarKinematicsFit):
             - corrected velocity dispersion must be in the range 50-400
               km/s
         """
-        sigcor = numpy.square(model_par['KIN'][:,1]) - numpy.square(model_par['SIGMACORR_EMP'])
+        sigcor = numpy.square(model_par['KIN'][:,1])
+        sigcor -= numpy.square(model_par['SIGMACORR_EMP'])
         indx = ((sigcor < 2500.) | (sigcor > 1.6e5)) & self.obj_to_fit
-        if numpy.sum(indx) == 0:
+        if not numpy.any(indx):
             return
-        model_par['MASK'][indx] = self.bitmask.turn_on(model_par['MASK'][indx], 'BAD_SIGMA')
+        model_par['MASK'][indx] |= self.bitmask.bit_value('BAD_SIGMA')
 
     def _save_results(self, global_fit_result, templates, templates_rfft, result, model_mask,
                       model_par):
@@ -1433,12 +1491,16 @@ class PPXFFit(StellarKinematicsFit):
         # Get the model spectra
         model_flux = PPXFFit.compile_model_flux(self.obj_flux, result)
 
-        # Calculate the model residuals.  They still need to be masked
-        # in regions that were *not* included in the fit; see the
-        # iterations below
-        residual = self.obj_flux - model_flux
-        fractional_residual = numpy.ma.divide(self.obj_flux - model_flux, model_flux)
-        chi2 = numpy.square(numpy.ma.divide(residual, self.obj_ferr))
+        # Calculate the model residuals.  The pixels included in the
+        # figures of merit are tracked by boolean arrays instead of
+        # masked arrays.  They still need to exclude the regions that
+        # were *not* included in the fit; see below.
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            residual = self.obj_flux.data - model_flux.data
+            fractional_residual = residual / model_flux.data
+            chi2 = numpy.square(residual / self.obj_ferr.data)
+        obj_gpm = numpy.logical_not(numpy.ma.getmaskarray(self.obj_flux))
+        resid_gpm = obj_gpm & numpy.logical_not(numpy.ma.getmaskarray(model_flux))
 
         # Instantiate a bad pixel mask to be used
         bpm = numpy.zeros_like(self.obj_wave, dtype=bool)
@@ -1450,105 +1512,125 @@ class PPXFFit(StellarKinematicsFit):
 #                                               flag='DIDNOTUSE')
 
         #---------------------------------------------------------------
-        # Need to iterate over each spectrum
-        for i in range(self.nobj):
-
-            #-----------------------------------------------------------
-            # Set output flags
-            # No fit was performed
-            if result[i] is None:
-                model_mask[i,:] = self.bitmask.turn_on(model_mask[i,:], 'NO_FIT')
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i], 'NO_FIT')
-                continue
+        # Test if the kinematics of all fitted spectra are near the imposed
+        # boundaries.  The best fitting models are still provided, but
+        # masked.
+        near_bound = numpy.zeros((self.nobj, self.moments), dtype=bool)
+        near_lower_sigma_bound = numpy.zeros(self.nobj, dtype=bool)
+        fit = numpy.array([r is not None and not r.empty_fit() for r in result])
+        if numpy.any(fit):
+            near_bound[fit], near_lower_sigma_bound[fit] \
+                    = self._is_near_bounds(numpy.array([r.kin for r in result[fit]]),
+                                           self.guess_kin[fit,0])
 
-            # No fit attempted because of insufficient data
-            if result[i].empty_fit():
-                model_mask[i,:] = self.bitmask.turn_on(model_mask[i,:], 'NO_FIT')
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i],
-                                                            'INSUFFICIENT_DATA')
-                continue
-
-            # Fit attempted but failed
-            if result[i].fit_failed():
-                model_mask[i,:] = self.bitmask.turn_on(model_mask[i,:], 'FIT_FAILED')
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i], 'FIT_FAILED')
-
-            # Fit successful but hit maximum iterations.
-            if result[i].reached_maxiter():
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i], 'MAXITER')
-
-            # Test if the kinematics are near the imposed boundaries.
-            # The best fitting model is still provided, but masked.
-            near_bound, near_lower_sigma_bound = self._is_near_bounds(result[i],
-                                                                      self.guess_kin[i,0])
-
-            # If the velocity dispersion has hit the lower limit, ONLY
-            # flag the value as having a MIN_SIGMA.
-            if near_lower_sigma_bound:
-                near_bound[1] = False
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i], 'MIN_SIGMA')
-            # Otherwise, flag both the model and parameter set
-            if numpy.any(near_bound):
-                if not self.quiet:
+        #---------------------------------------------------------------
+        # Set output flags
+        if numpy.any(~fit):
+            # No fit was performed, either by request or because of
+            # insufficient data
+            model_mask[~fit,:] |= self.bitmask.bit_value('NO_FIT')
+            no_fit = numpy.array([r is None for r in result])
+            model_par['MASK'][no_fit] |= self.bitmask.bit_value('NO_FIT')
+            empty = ~fit & ~no_fit
+            model_par['MASK'][empty] |= self.bitmask.bit_value('INSUFFICIENT_DATA')
+
+        # Fit attempted but failed
+        failed = numpy.zeros(self.nobj, dtype=bool)
+        failed[fit] = [r.fit_failed() for r in result[fit]]
+        if numpy.any(failed):
+            model_mask[failed,:] |= self.bitmask.bit_value('FIT_FAILED')
+            model_par['MASK'][failed] |= self.bitmask.bit_value('FIT_FAILED')
+
+        # Fit successful but hit maximum iterations.
+        maxiter = numpy.zeros(self.nobj, dtype=bool)
+        maxiter[fit] = [r.reached_maxiter() for r in result[fit]]
+        if numpy.any(maxiter):
+            model_par['MASK'][maxiter] |= self.bitmask.bit_value('MAXITER')
+
+        # If the velocity dispersion has hit the lower limit, ONLY flag
+        # the value as having a MIN_SIGMA.
+        if numpy.any(near_lower_sigma_bound):
+            near_bound[near_lower_sigma_bound,1] = False
+            model_par['MASK'][near_lower_sigma_bound] |= self.bitmask.bit_value('MIN_SIGMA')
+        # Otherwise, flag both the model and parameter set
+        near_bound = numpy.any(near_bound, axis=1)
+        if numpy.any(near_bound):
+            if not self.quiet:
+                for i in numpy.flatnonzero(near_bound):
                     warnings.warn('Returned parameters for spectrum {0} too close to '
                                   'bounds.'.format(i+1))
-                model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i], 'NEAR_BOUND')
-#                model_mask[i,:] = self.bitmask.turn_on(model_mask[i,:], 'NEAR_BOUND')
+            model_par['MASK'][near_bound] |= self.bitmask.bit_value('NEAR_BOUND')
 
-            # Mask rejected pixels
+        # Mask rejected pixels; i.e., pixels in the fitted range that
+        # were not masked in the input but were not used in the fit
+        rejected = numpy.zeros(model_mask.shape, dtype=bool)
+        for i in numpy.flatnonzero(fit):
             s = self.spectrum_start[i]
             e = self.spectrum_end[i]
-            original_gpm = numpy.where(numpy.invert(self.obj_flux.mask[i,s:e]))[0]
-            rejected_pixels = list(set(original_gpm) - set(result[i].gpm))
-            if len(rejected_pixels) > 0:
-                model_mask[i,s:e][rejected_pixels] \
-                        = self.bitmask.turn_on(model_mask[i,s:e][rejected_pixels],
-                                               flag=PPXFFit.rej_flag)
-
-            #-----------------------------------------------------------
-            # Save the model parameters and figures of merit
+            rejected[i,s:e] = obj_gpm[i,s:e]
+            rejected[i,s+result[i].gpm] = False
+        if numpy.any(rejected):
+            model_mask[rejected] |= self.bitmask.bit_value(PPXFFit.rej_flag)
 
+        #---------------------------------------------------------------
+        # Save the model parameters and figures of merit
+        if numpy.any(fit):
             # Number of fitted pixels
-            model_par['NPIXFIT'][i] = len(result[i].gpm)
+            model_par['NPIXFIT'][fit] = [len(r.gpm) for r in result[fit]]
+            # Templates used
+            usetpl = numpy.array([r.tpl_to_use for r in result[fit]])
+            model_par['USETPL'][fit] = usetpl
             # Template weights and errors
+            has_err = numpy.array([r.tplwgterr is not None for r in result[fit]])
             if self._mode_uses_global_template():
-                model_par['TPLWGT'][i] = result[i].tplwgt[0]*global_fit_result.tplwgt
-                if result[i].tplwgterr is not None:
-                    model_par['TPLWGTERR'][i] = result[i].tplwgterr[0]*global_fit_result.tplwgt
+                model_par['TPLWGT'][fit] = numpy.array([r.tplwgt[0] for r in result[fit]])[:,None] \
+                                                * global_fit_result.tplwgt[None,:]
+                if numpy.any(has_err):
+                    _fit = numpy.flatnonzero(fit)[has_err]
+                    model_par['TPLWGTERR'][_fit] \
+                            = numpy.array([r.tplwgterr[0] for r in result[_fit]])[:,None] \
+                                    * global_fit_result.tplwgt[None,:]
             else:
-                model_par['TPLWGT'][i][result[i].tpl_to_use] = result[i].tplwgt
-                if result[i].tplwgterr is not None:
-                    model_par['TPLWGTERR'][i][result[i].tpl_to_use] = result[i].tplwgterr
-            # Templates used
-            model_par['USETPL'][i] = result[i].tpl_to_use
+                tplwgt = numpy.zeros(usetpl.shape, dtype=float)
+                tplwgt[usetpl] = numpy.concatenate([r.tplwgt for r in result[fit]])
+                model_par['TPLWGT'][fit] = tplwgt
+                if numpy.any(has_err):
+                    _fit = numpy.flatnonzero(fit)[has_err]
+                    tplwgterr = numpy.zeros((_fit.size, usetpl.shape[1]), dtype=float)
+                    tplwgterr[usetpl[has_err]] \
+                            = numpy.concatenate([r.tplwgterr for r in result[_fit]])
+                    model_par['TPLWGTERR'][_fit] = tplwgterr
             # Additive polynomial coefficients
             # TODO: Save nominal polynomial errors as well?
-            if self.degree >= 0 and result[i].addcoef is not None:
-                model_par['ADDCOEF'][i] = result[i].addcoef
-            if self.mdegree > 0 and result[i].multcoef is not None:
-                model_par['MULTCOEF'][i] = result[i].multcoef
+            if self.degree >= 0:
+                model_par['ADDCOEF'][fit] = numpy.array([r.addcoef for r in result[fit]])
+            if self.mdegree > 0:
+                model_par['MULTCOEF'][fit] = numpy.array([r.multcoef for r in result[fit]])
             # Input kinematics
-            model_par['KININP'][i] = self.guess_kin[i,:]
+            model_par['KININP'][fit] = self.guess_kin[fit,:]
             # Best-fit kinematics
-            model_par['KIN'][i] = result[i].kin
+            model_par['KIN'][fit] = numpy.array([r.kin for r in result[fit]])
             # Kinematic errors
-            model_par['KINERR'][i] = result[i].kinerr
+            model_par['KINERR'][fit] = numpy.array([r.kinerr for r in result[fit]])
 
-            # Ensure that only pixels used in the fit are included in
-            # the fit metrics
-            chi2[i,model_mask[i,:]>0] = numpy.ma.masked
-            residual[i,model_mask[i,:]>0] = numpy.ma.masked
-            fractional_residual[i,model_mask[i,:]>0] = numpy.ma.masked
+        # Ensure that only pixels used in the fit are included in the
+        # fit metrics
+        resid_gpm &= numpy.logical_not(fit[:,None] & (model_mask > 0))
+        frac_gpm = resid_gpm & (model_flux.data != 0) & numpy.isfinite(fractional_residual)
+        chi2_gpm = resid_gpm & numpy.logical_not(numpy.ma.getmaskarray(self.obj_ferr)) \
+                        & numpy.isfinite(chi2)
 
+        # The remaining metrics need the pixels used by each fit
+        for i in numpy.flatnonzero(fit):
             # Get growth statistics for the three figures of merit
             model_par['CHIGRW'][i] \
-                        = sample_growth(numpy.ma.sqrt(chi2[i,:]).compressed(),
+                        = sample_growth(numpy.sqrt(chi2[i,chi2_gpm[i]]),
                                         [0.0, 0.68, 0.95, 0.99, 1.0], use_interpolate=False)
             model_par['RMSGRW'][i] \
-                        = sample_growth(numpy.ma.absolute(residual[i,:]).compressed(),
+                        = sample_growth(numpy.absolute(residual[i,resid_gpm[i]]),
                                         [0.0, 0.68, 0.95, 0.99, 1.0], use_interpolate=False)
             model_par['FRMSGRW'][i] \
-                        = sample_growth(numpy.ma.absolute(fractional_residual[i,:]).compressed(),
+                        = sample_growth(numpy.absolute(fractional_residual[i,frac_gpm[i]]),
                                         [0.0, 0.68, 0.95, 0.99, 1.0], use_interpolate=False)
 
             # Calculate the dispersion correction if necessary
@@ -1557,14 +1639,18 @@ class PPXFFit(StellarKinematicsFit):
                         = self._nominal_dispersion_correction(self.obj_sres[i], result[i].gpm,
                                         PPXFFit.convert_velocity(model_par['KIN'][i,0], 0)[0])
                 if err:
-                    model_par['MASK'][i] = self.bitmask.turn_on(model_par['MASK'][i],
-                                                                'BAD_SIGMACORR_SRES')
-
-        # Get the figures-of-merit for each spectrum
-        model_par['CHI2'] = numpy.ma.sum(chi2, axis=1).filled(0.0)
-        model_par['RMS'] = numpy.sqrt(numpy.ma.mean(numpy.square(residual), axis=1).filled(0.0))
-        model_par['FRMS'] = numpy.sqrt(numpy.ma.mean(numpy.square(fractional_residual),
-                                                     axis=1).filled(0.0))
+                    model_par['MASK'][i] |= self.bitmask.bit_value('BAD_SIGMACORR_SRES')
+
+        # Get the figures-of-merit for each spectrum; spectra without
+        # any valid pixels are set to 0.
+        def _rms(x, gpm):
+            n = numpy.sum(gpm, axis=1)
+            _x = numpy.where(gpm, x, 0.)
+            return numpy.sqrt(numpy.divide(numpy.einsum('ij,ij->i', _x, _x), n,
+                                           out=numpy.zeros(n.size, dtype=float), where=n > 0))
+        model_par['CHI2'] = numpy.sum(numpy.where(chi2_gpm, chi2, 0.), axis=1)
+        model_par['RMS'] = _rms(residual, resid_gpm)
+        model_par['FRMS'] = _rms(fractional_residual, frac_gpm)
         dof = numpy.sum(model_par['TPLWGT'], axis=1) + self.dof 
         model_par['RCHI2'] = model_par['CHI2'] / (model_par['NPIXFIT'] - dof)
 
@@ -1577,8 +1663,7 @@ class PPXFFit(StellarKinematicsFit):
                     = self._fit_dispersion_correction(templates, templates_rfft, result,
                                                       baseline_dispersion=100)
             if numpy.sum(err) > 0:
-                model_par['MASK'][err] = self.bitmask.turn_on(model_par['MASK'][err],
-                                                              'BAD_SIGMACORR_EMP')
+                model_par['MASK'][err] |= self.bitmask.bit_value('BAD_SIGMACORR_EMP')
 
         #---------------------------------------------------------------
         # Test if kinematics are reliable
@@ -1917,7 +2002,9 @@ class PPXFFit(StellarKinematicsFit):
         self.ntpl, self.npix_tpl = self.tpl_flux.shape
         self.tpl_npad = 2**int(numpy.ceil(numpy.log2(self.npix_tpl)))
 #        self.tpl_npad = fftpack.next_fast_len(self.npix_tpl)
-        self.tpl_rfft = numpy.fft.rfft(self.tpl_flux, self.tpl_npad, axis=1)
+        # Compute the FFT of all templates at once.  pPXF uses these for
+        # every fit instead of computing its own.
+        self.tpl_rfft = fft.rfft(self.tpl_flux, self.tpl_npad, axis=1)
 
         # - Template usage
         self.usetpl = PPXFFit.check_template_usage_flags(self.nobj, self.ntpl, usetpl)
@@ -2009,8 +2096,8 @@ class PPXFFit(StellarKinematicsFit):
                                         shape=self.nobj)
 
         # Set the bins; here the ID and index are identical
-        model_par['BINID'] = numpy.arange(self.nobj)
-        model_par['BINID_INDEX'] = numpy.arange(self.nobj)
+        model_par['BINID'] = numpy.arange(self.nobj, dtype=model_par['BINID'].dtype)
+        model_par['BINID_INDEX'] = model_par['BINID']
 
         # Save the pixel statistics
         model_par['BEGPIX'] = self.spectrum_start
@@ -2019,14 +2106,14 @@ class PPXFFit(StellarKinematicsFit):
 
         #---------------------------------------------------------------
         # Flag any errors in the fitted spectral range initialization
-        ended_in_error = numpy.array([e is not None for e in init_pix_err])
+        ended_in_error = numpy.fromiter((e is not None for e in init_pix_err), dtype=bool,
+                                        count=len(init_pix_err))
         if numpy.any(ended_in_error):
             if not self.quiet:
                 warnings.warn('Masking failures in some/all spectra.  Errors are: {0}'.format(
                                 numpy.array([(i,e)
                                             for i,e in enumerate(init_pix_err)])[ended_in_error]))
-            model_par['MASK'][ended_in_error] \
-                    = self.bitmask.turn_on(model_par['MASK'][ended_in_error], 'NO_FIT')
+            model_par['MASK'][ended_in_error] |= self.bitmask.bit_value('NO_FIT')
         if numpy.all(ended_in_error):
             return self.obj_wave, model_flux, model_mask, model_par
 
@@ -2034,11 +2121,10 @@ class PPXFFit(StellarKinematicsFit):
         # Get the input pixel shift between the object and template
         # wavelength vectors; interpretted by pPXF as a base velocity
         # shift between the two
-        self.base_velocity = numpy.array([PPXFFit.ppxf_tpl_obj_voff(self.tpl_wave,
-                                                            self.obj_wave[s:e], self.velscale,
-                                                            velscale_ratio=self.velscale_ratio)
-                                                for s,e in zip(self.spectrum_start,
-                                                               self.spectrum_end)])
+        self.base_velocity = PPXFFit.ppxf_tpl_obj_voff(self.tpl_wave, self.obj_wave,
+                                                       self.velscale,
+                                                       velscale_ratio=self.velscale_ratio,
+                                                       start=self.spectrum_start)
 
         #---------------------------------------------------------------
         # Fit the global spectrum if requested by the iteration mode
@@ -2049,8 +2135,8 @@ class PPXFFit(StellarKinematicsFit):
             global_fit_result = self._fit_global_spectrum(obj_to_include=self.obj_to_fit, plot=plot)
             if global_fit_result.fit_failed():
                 # pPXF failed!  
-                model_mask[:] = self.bitmask.turn_on(model_mask[:], 'FIT_FAILED')
-                model_par['MASK'][:] = self.bitmask.turn_on(model_par['MASK'][:], 'FIT_FAILED')
+                model_mask |= self.bitmask.bit_value('FIT_FAILED')
+                model_par['MASK'] |= self.bitmask.bit_value('FIT_FAILED')
                 return self.obj_wave, model_flux, model_mask, model_par
             if not self.quiet:
                 log_output(self.loggers, 1, logging.INFO,
@@ -2062,10 +2148,10 @@ class PPXFFit(StellarKinematicsFit):
         if self._mode_uses_global_template():
             templates = numpy.dot(global_fit_result.tplwgt, self.tpl_flux).reshape(1,-1)
             tpl_to_use = numpy.ones((self.nobj,1), dtype=bool)
-            templates_rfft = numpy.fft.rfft(templates, self.tpl_npad, axis=1)
+            templates_rfft = fft.rfft(templates, self.tpl_npad, axis=1)
         elif self._mode_uses_nonzero_templates():
             templates = self.tpl_flux
-            tpl_to_use = numpy.array([global_fit_result.tplwgt > 0]*self.nobj) & self.usetpl
+            tpl_to_use = (global_fit_result.tplwgt > 0)[None,:] & self.usetpl
             templates_rfft = self.tpl_rfft
         elif self._mode_uses_all_templates():
             templates = self.tpl_flux
@@ -2084,8 +2170,12 @@ class PPXFFit(StellarKinematicsFit):
 #                       + ' {0:>5} {1:>9} {2:>5} {3:>4}'.format('NZTPL', 'CHI2', 'RCHI2', 'STAT'))
 
         # Fit all spectra
+        t = time.perf_counter()
         result = self._fit_all_spectra(templates, templates_rfft, tpl_to_use, plot=plot,
                                        plot_file_root=plot_file_root)
+        if not self.quiet:
+            log_output(self.loggers, 1, logging.INFO, 'Fits completed in {0:.4e} min.'.format(
+                       (time.perf_counter() - t)/60))
 
         #---------------------------------------------------------------
         # Save the results
@@ -2292,7 +2382,7 @@ class PPXFFit(StellarKinematicsFit):
         return fit_indx, waverange_mask, npix_mask, alias_mask
 
     @staticmethod
-    def ppxf_tpl_obj_voff(tpl_wave, obj_wave, velscale, velscale_ratio=None):
+    def ppxf_tpl_obj_voff(tpl_wave, obj_wave, velscale, velscale_ratio=None, start=None):
         """
         Determine the pseudo offset in velocity between the template and
         object spectra, just due to the difference in the starting
@@ -2316,17 +2406,25 @@ class PPXFFit(StellarKinematicsFit):
                 when constructing the template library.  Default is
                 None, which is the same as assuming that the velocity
                 scales are identical.
+            start (int, numpy.ndarray): (**Optional**) Index of the
+                first pixel in ``obj_wave`` of the object spectrum.  If
+                an array, the offset is calculated for each starting
+                pixel.  Default is to use the first pixel.
     
         Returns:
-            float: Velocity offset in km/s between the initial wavelengths
-            of the template and object spectra.
+            float, numpy.ndarray: Velocity offset in km/s between the
+            initial wavelengths of the template and object spectra.  If
+            ``start`` is an array, the returned array has the same
+            shape.
 
         .. todo::
             - Implement a check that calculates the velocity ratio directly?
         """
-        dlogl = numpy.log(obj_wave[0])-numpy.log(tpl_wave[0]) if velscale_ratio is None \
-                        else numpy.log(obj_wave[0])-numpy.mean(numpy.log(tpl_wave[0:velscale_ratio]))
-        return dlogl*velscale / numpy.diff(numpy.log(obj_wave[0:2]))[0]
+        _start = 0 if start is None else numpy.asarray(start)
+        logw0 = numpy.log(obj_wave[_start])
+        dlogl = logw0-numpy.log(tpl_wave[0]) if velscale_ratio is None \
+                        else logw0-numpy.mean(numpy.log(tpl_wave[0:velscale_ratio]))
+        return dlogl*velscale / (numpy.log(obj_wave[_start+1]) - logw0)
 
     @staticmethod
     def check_templates(tpl_wave, tpl_flux, tpl_sres=None, velscale_ratio=None):
@@ -2350,7 +2448,9 @@ class PPXFFit(StellarKinematicsFit):
         if velscale_ratio is not None and velscale_ratio > 1:
             npix_tpl = len(tpl_wave) - len(tpl_wave) % velscale_ratio
             _tpl_wave = tpl_wave[:npix_tpl]
-            _tpl_flux = tpl_flux[:,:npix_tpl]
+            # Copy the trimmed spectra so that the spectral axis stays
+            # contiguous for the FFTs
+            _tpl_flux = numpy.ascontiguousarray(tpl_flux[:,:npix_tpl])
             _tpl_sres = None if tpl_sres is None else tpl_sres[:npix_tpl]
         else:
             _tpl_wave = tpl_wave
@@ -2467,13 +2567,15 @@ class PPXFFit(StellarKinematicsFit):
 
         if not quiet:
             log_output(loggers, 1, logging.INFO, 'Rejecting full spectrum outliers.')
+        nmasked = numpy.sum(numpy.ma.getmaskarray(obj_flux))
         for i in range(niter):
             residual = obj_flux-model_flux  # This should be masked where the data were not fit
-            sigma = numpy.array([numpy.ma.std(residual, axis=1)]*residual.shape[1]).T
+            sigma = numpy.ma.std(residual, axis=1)[:,None]
             indx = numpy.absolute(residual) > nsigma*sigma
-            old_mask = numpy.ma.getmaskarray(obj_flux).copy()
             obj_flux[indx] = numpy.ma.masked
-            if numpy.sum(numpy.ma.getmaskarray(obj_flux)) == numpy.sum(old_mask):
+            old_nmasked = nmasked
+            nmasked = numpy.sum(numpy.ma.getmaskarray(obj_flux))
+            if nmasked == old_nmasked:
                 break
         return obj_flux
 
@@ -2612,10 +2714,11 @@ class PPXFFit(StellarKinematicsFit):
         # Get the input pixel shift between the object and template
         # wavelength vectors; interpretted by pPXF as a base velocity
         # shift between the two
-        vsyst = numpy.array([ -PPXFFit.ppxf_tpl_obj_voff(_tpl_wave, _obj_wave[s:e], _velscale,
-                                                         velscale_ratio=_velscale_ratio)
-                                    if e > s else 0.0
-                                    for s,e in zip(model_par['BEGPIX'], model_par['ENDPIX'])])
+        vsyst = numpy.zeros(model_par['BEGPIX'].size, dtype=float)
+        indx = model_par['ENDPIX'] > model_par['BEGPIX']
+        vsyst[indx] = -PPXFFit.ppxf_tpl_obj_voff(_tpl_wave, _obj_wave, _velscale,
+                                                 velscale_ratio=_velscale_ratio,
+                                                 start=model_par['BEGPIX'][indx])
 
         # Get the additive and multiplicative degree of the polynomials
         degree = model_par['ADDCOEF'].shape
@@ -46,6 +46,8 @@ from .util import sample_growth
 from .ppxffit import PPXFModel, PPXFFit
 from ..contrib.xjmc import emline_fitter_with_ppxf, ppxf_tied_parameters
 
+# Speed of light in km/s
+_c_kms = astropy.constants.c.to('km/s').value
 
 class SasukePar(KeywordParSet):
     r"""
@@ -188,16 +190,15 @@ class SasukePar(KeywordParSet):
 
         """
         # Fill the guess kinematics
-        c = astropy.constants.c.to('km/s').value
         nbins = binned_spectra.nbins
         if isinstance(guess_vel, (list, numpy.ndarray)):
             _guess_vel = numpy.asarray(guess_vel)
             if _guess_vel.size > 1 and _guess_vel.size != nbins:
                 raise ValueError('Incorrect number of guess velocities provided; expected '
                                  f'{nbins}, found {_guess_vel.size}.')
-            self['guess_redshift'] = _guess_vel.copy()/c
+            self['guess_redshift'] = _guess_vel.copy()/_c_kms
         elif guess_vel is not None:
-            self['guess_redshift'] = numpy.full(nbins, guess_vel/c, dtype=float)
+            self['guess_redshift'] = numpy.full(nbins, guess_vel/_c_kms, dtype=float)
         else:
             self['guess_redshift'] = numpy.zeros(nbins, dtype=float)
 
@@ -464,11 +465,6 @@ class Sasuke(EmissionLineFit):
         npix_tpl (int):
             Number of pixels in template spectra (i.e., :math:`N_{\rm
             pix,t}`).
-        tpl_npad (int):
-            Nearest length for FFT, :math:`N_{\rm pad}`.
-        tpl_rfft (numpy.ndarray):
-            The complex array with the real FFT of the template spectra.
-            Shape is :math:`(N_{\rm tpl}, N_{\rm pad}/2 + 1)`.
         velscale_ratio (int):
             The **integer** ratio between the velocity scale of the
             pixel in the galaxy data to that of the template data.
@@ -506,6 +502,16 @@ class Sasuke(EmissionLineFit):
             Array of lists where each list provdes the starting
             parameters for the kinematics of each component.  Shape is
             :math:`(N_{\rm comp},)`.
+        tied (:obj:`list`):
+            The pPXF parameter tying object for the full set of
+            templates; see
+            :func:`~mangadap.contrib.xjmc.ppxf_tied_parameters`.  Can be
+            None if no parameters are tied.
+        tied_indx (numpy.ndarray):
+            The index of the kinematic parameter to which each
+            parameter is tied, parsed from :attr:`tied`.  Free
+            parameters are "tied" to themselves.  Shape is
+            :math:`(N_{\rm kin},)`.
         npar_kin (int):
             The total number of kinematic parameters, which is just the
             sum of the absolute value of :attr:`comp_moments`,
@@ -598,8 +604,6 @@ class Sasuke(EmissionLineFit):
         self.nstpl = None
         self.ntpl = None
         self.npix_tpl = None
-        self.tpl_npad = None
-        self.tpl_rfft = None
         self.gas_tpl = None
 
         self.velscale_ratio = None
@@ -617,6 +621,8 @@ class Sasuke(EmissionLineFit):
         self.tpl_sgrp = None
         self.comp_moments = None
         self.comp_start_kin = None
+        self.tied = None
+        self.tied_indx = None
         self.npar_kin = None
         self.nfree_kin = None
 
@@ -758,13 +764,10 @@ class Sasuke(EmissionLineFit):
             limit.
 
         """
-        nspec = kin.shape[0]        # Number of spectra fit
-
         # Offset velocity: bounded by *deviations* from input value
-        _lbound = numpy.array([lbound]*nspec)
-        _ubound = numpy.array([ubound]*nspec)
-        _lbound[:,vel_indx] += kin_inp[:,vel_indx]
-        _ubound[:,vel_indx] += kin_inp[:,vel_indx]
+        offset = numpy.where(vel_indx[None,:], kin_inp, 0.)
+        _lbound = lbound[None,:] + offset
+        _ubound = ubound[None,:] + offset
 
         # Set the tolerance
         Db = _ubound-_lbound
@@ -944,17 +947,13 @@ class Sasuke(EmissionLineFit):
                     self.gh_limits[1], self.gh_limits[1], self.gh_limits[1] ]
         lbound = []
         ubound = []
-        tied = ppxf_tied_parameters(self.tpl_comp, self.tpl_vgrp, self.tpl_sgrp, self.comp_moments)
         par_indx = []
         vel_indx = numpy.zeros(self.npar_kin, dtype=bool)
         sig_indx = numpy.zeros(self.npar_kin, dtype=bool)
         for j in range(self.ncomp):
             ii = numpy.sum(numpy.absolute(self.comp_moments[:j]))
             nmom = numpy.absolute(self.comp_moments[j])
-            par_indx += [ [0]*nmom ]
-            for k in range(nmom):
-                par_indx[j][k] = ii+k if tied is None or len(tied[j][k]) == 0 \
-                                            else int(tied[j][k].split('[')[1].split(']')[0])
+            par_indx += [ self.tied_indx[ii:ii+nmom] ]
             vel_indx[ii+0] = True
             sig_indx[ii+1] = True
             lbound += [ lboundi[:nmom] ]
@@ -963,30 +962,38 @@ class Sasuke(EmissionLineFit):
         ubound = numpy.concatenate(tuple(ubound))
 
         # Set the model data to masked arrays
-        model_flux = numpy.ma.MaskedArray(model_flux.data, mask=model_mask > 0)
-        model_eml_flux = numpy.ma.MaskedArray(model_eml_flux.data, mask=model_mask > 0)
+        model_bpm = model_mask > 0
+        model_flux = numpy.ma.MaskedArray(model_flux.data, mask=model_bpm)
+        model_eml_flux = numpy.ma.MaskedArray(model_eml_flux.data, mask=model_bpm.copy())
 
         # Save the pixel statistics
         model_fit_par['BEGPIX'][:] = start
         model_fit_par['ENDPIX'][:] = end
         model_fit_par['NPIXTOT'][:] = end - start
-        model_fit_par['NPIXFIT'] = numpy.array([numpy.sum(numpy.logical_not(
-                                                 numpy.ma.getmaskarray(model_flux)[i,s:e]))
-                                                    for i,(s,e) in enumerate(zip(start,end))])
+        pix = numpy.arange(model_bpm.shape[1])
+        model_fit_par['NPIXFIT'] = numpy.sum(numpy.logical_not(model_bpm)
+                                             & (pix[None,:] >= start[:,None])
+                                             & (pix[None,:] < end[:,None]), axis=1)
 
         # Calculate the model residuals, which are masked where the data
         # were not fit
         residual = flux - model_flux
         fractional_residual = numpy.ma.divide(residual, model_flux)
-        chi2 = numpy.square(numpy.ma.divide(residual, ferr))
-
-        # Get the figures-of-merit for each spectrum
-        model_fit_par['CHI2'] = numpy.ma.sum(chi2, axis=1).filled(0.0)
+        chi = numpy.ma.divide(residual, ferr)
+        chi2 = numpy.square(chi)
+
+        # Get the figures-of-merit for each spectrum; spectra without
+        # any valid pixels are set to 0.
+        def _rms(x):
+            n = x.count(axis=1)
+            _x = x.filled(0.0)
+            return numpy.sqrt(numpy.divide(numpy.einsum('ij,ij->i', _x, _x), n,
+                                           out=numpy.zeros(n.size, dtype=float), where=n > 0))
+        _chi = chi.filled(0.0)
+        model_fit_par['CHI2'] = numpy.einsum('ij,ij->i', _chi, _chi)
         # Get the (fractional) residual RMS for each spectrum
-        model_fit_par['RMS'] = numpy.sqrt(numpy.ma.mean(numpy.square(residual),
-                                                        axis=1).filled(0.0))
-        model_fit_par['FRMS'] = numpy.sqrt(numpy.ma.mean(numpy.square(fractional_residual),
-                                                         axis=1).filled(0.0))
+        model_fit_par['RMS'] = _rms(residual)
+        model_fit_par['FRMS'] = _rms(fractional_residual)
 
         # Save the weights and errors
         model_fit_par['TPLWGT'][spec_to_fit,:] = model_wgts
@@ -996,23 +1003,21 @@ class Sasuke(EmissionLineFit):
         # velocity group, and sigma group associated with each
         # template are the same for all fits
         nspec = self.nobj if self.nremap == 0 else self.nremap
-        model_fit_par['KINCMP'] = numpy.array([self.tpl_comp]*nspec)
-        model_fit_par['VELCMP'] = numpy.array([self.tpl_vgrp]*nspec)
-        model_fit_par['SIGCMP'] = numpy.array([self.tpl_sgrp]*nspec)
-        model_fit_par['TIEDKIN'] = numpy.array([numpy.concatenate(tuple(par_indx))]*nspec)
+        model_fit_par['KINCMP'][:] = self.tpl_comp
+        model_fit_par['VELCMP'][:] = self.tpl_vgrp
+        model_fit_par['SIGCMP'][:] = self.tpl_sgrp
+        tiedkin = self.tied_indx
+        model_fit_par['TIEDKIN'][:] = tiedkin
 
         # Get the number of degress of freedom for each fit: The
         # kinematics have to be free and tied to a template with
-        # a non-zero weight.
-        kin_is_free = (numpy.arange(model_fit_par['TIEDKIN'].shape[1])
-                            - model_fit_par['TIEDKIN'][0,:]) == 0
-        kin_is_used = numpy.zeros_like(model_fit_par['TIEDKIN'], dtype=bool)
-        for i in range(nspec):
-            indx = model_fit_par['TPLWGT'][i,:] > 0
-            cmp_is_used = numpy.unique(model_fit_par['KINCMP'][i,indx])
-            for c in cmp_is_used:
-                nprev = numpy.sum(numpy.absolute(self.comp_moments[:c]))
-                kin_is_used[i,nprev:nprev+self.comp_moments[c]] = True
+        # a non-zero weight.  Kinematic components with fixed
+        # parameters (negative moments) never contribute.
+        kin_is_free = (numpy.arange(tiedkin.size) - tiedkin) == 0
+        par_comp = numpy.repeat(numpy.arange(self.ncomp), numpy.absolute(self.comp_moments))
+        cmp_is_used = numpy.dot(model_fit_par['TPLWGT'] > 0,
+                                self.tpl_comp[:,None] == numpy.arange(self.ncomp)[None,:])
+        kin_is_used = cmp_is_used[:,par_comp] & (self.comp_moments > 0)[par_comp][None,:]
 
         # Save the polynomial coefficients
         used_apoly = False
@@ -1059,8 +1064,7 @@ class Sasuke(EmissionLineFit):
         #   lines, ONLY flag the value as having a MIN_SIGMA.
         indx = numpy.all(near_lower_bound & sig_indx[None,:], axis=1)
         if numpy.sum(indx) > 0:
-            model_fit_par['MASK'][indx] \
-                    = self.bitmask.turn_on(model_fit_par['MASK'][indx], 'MIN_SIGMA')
+            model_fit_par['MASK'][indx] |= self.bitmask.bit_value('MIN_SIGMA')
 
         # - Otherwise, flag the full fit (parameters and model) as
         #   NEAR_BOUND if all the parameters are near the boundary but
@@ -1068,15 +1072,13 @@ class Sasuke(EmissionLineFit):
         indx = numpy.all( (near_lower_bound & numpy.invert(sig_indx)[None,:])
                             | (near_bound & numpy.invert(near_lower_bound)), axis=1)
         if numpy.sum(indx) > 0:
-            model_fit_par['MASK'][indx] = self.bitmask.turn_on(model_fit_par['MASK'][indx],
-                                                               'NEAR_BOUND')
+            model_fit_par['MASK'][indx] |= self.bitmask.bit_value('NEAR_BOUND')
 #            model_mask[indx,:] = self.bitmask.turn_on(model_mask[indx,:], 'NEAR_BOUND')
 
         # - Flag the spectrum was not fit
         if not numpy.all(spec_to_fit):
             indx = numpy.invert(spec_to_fit)
-            model_fit_par['MASK'][indx] = self.bitmask.turn_on(model_fit_par['MASK'][indx],
-                                                               'NO_FIT')
+            model_fit_par['MASK'][indx] |= self.bitmask.bit_value('NO_FIT')
 #            model_mask[indx,:] = self.bitmask.turn_on(model_mask[indx,:], 'NO_FIT')
 
         # Convert the velocities from pixel units to cz
@@ -1088,64 +1090,63 @@ class Sasuke(EmissionLineFit):
                                                model_fit_par['KINERR'][:,vel_indx])
 
         # Divvy up the fitted parameters into the result for each
-        # emission line
-        for j in range(self.neml):
-            if not self.fit_eml[j]:
-                continue
-
-            # The "fit index" is the component of the line
-            model_eml_par['FIT_INDEX'][:,j] = self.eml_compi[j]
-
-            # Use the flattened vectors to set the kinematics
-            indx = par_indx[self.eml_compi[j]]
-            model_eml_par['KIN'][:,j,:] = model_fit_par['KIN'][:,indx]
-            model_eml_par['KINERR'][:,j,:] = model_fit_par['KINERR'][:,indx]
-            z = model_eml_par['KIN'][:,j,0]/astropy.constants.c.to('km/s').value
-
-            # Use the fitted weights to set the gas flux; the
-            # EmissionLineTemplates class constructs each line to have
-            # the flux provided by the emission-line database in the
-            # rest frame.  The ppxf convolution keeps the sum of the
-            # template constant, meaning that the total flux in the line
-            # increases with redshift.
-            model_eml_par['FLUX'][:,j] = model_fit_par['TPLWGT'][:,self.eml_tpli[j]] \
-                                            * etpl.line_flux[j] * (1 + z)
-            model_eml_par['FLUXERR'][:,j] = model_fit_par['TPLWGTERR'][:,self.eml_tpli[j]] \
-                                                * etpl.line_flux[j] * (1 + z)
-
-            # Get the bound masks specific to this emission-line (set)
-            # - Determine if the emission-line was part of a rejected
-            # template
-            flg = numpy.any(no_data[:,indx], axis=1)
-            if numpy.sum(flg) > 0:
-                model_eml_par['MASK'][flg,j] = self.bitmask.turn_on(model_eml_par['MASK'][flg,j],
-                                                                    'INSUFFICIENT_DATA')
-
-            # - Determine if the velocity dispersion parameter of this
-            #   line has hit the lower limit; if so, ONLY flag the value
-            #   as having a MIN_SIGMA.
-            flg = numpy.any(near_lower_bound[:,indx] & sig_indx[None,indx], axis=1)
-            if numpy.sum(flg) > 0:
-                model_eml_par['MASK'][flg,j] = self.bitmask.turn_on(model_eml_par['MASK'][flg,j],
-                                                                    'MIN_SIGMA')
-
-            # - Determine if any of the kinematic parameters are near
-            #   the bound (excluding the lower velocity dispersion
-            #   limit)
-            flg = numpy.any((near_lower_bound[:,indx] & numpy.invert(sig_indx)[None,indx])
-                                | (near_bound[:,indx] & numpy.invert(near_lower_bound[:,indx])),
-                            axis=1)
-            if numpy.sum(flg) > 0:
-                model_eml_par['MASK'][flg,j] = self.bitmask.turn_on(model_eml_par['MASK'][flg,j],
-                                                                    'NEAR_BOUND')
+        # fitted emission line
+        eml = numpy.flatnonzero(self.fit_eml)
+        compi = self.eml_compi[eml]
+
+        # The "fit index" is the component of the line
+        model_eml_par['FIT_INDEX'][:,eml] = compi[None,:]
+
+        # Use the flattened vectors to set the kinematics
+        indx = numpy.array([par_indx[c] for c in compi], dtype=int)
+        model_eml_par['KIN'][:,eml,:] = model_fit_par['KIN'][:,indx]
+        model_eml_par['KINERR'][:,eml,:] = model_fit_par['KINERR'][:,indx]
+        z = model_eml_par['KIN'][:,eml,0]/_c_kms
+
+        # Use the fitted weights to set the gas flux; the
+        # EmissionLineTemplates class constructs each line to have the
+        # flux provided by the emission-line database in the rest
+        # frame.  The ppxf convolution keeps the sum of the template
+        # constant, meaning that the total flux in the line increases
+        # with redshift.
+        model_eml_par['FLUX'][:,eml] = model_fit_par['TPLWGT'][:,self.eml_tpli[eml]] \
+                                            * etpl.line_flux[eml][None,:] * (1 + z)
+        model_eml_par['FLUXERR'][:,eml] = model_fit_par['TPLWGTERR'][:,self.eml_tpli[eml]] \
+                                            * etpl.line_flux[eml][None,:] * (1 + z)
+
+        # Get the bound masks specific to each emission-line (set)
+        eml_mask = model_eml_par['MASK'][:,eml]
+        # - Determine if the emission-line was part of a rejected
+        #   template
+        flg = numpy.any(no_data[:,indx], axis=2)
+        if numpy.any(flg):
+            eml_mask[flg] |= self.bitmask.bit_value('INSUFFICIENT_DATA')
+
+        # - Determine if the velocity dispersion parameter of each line
+        #   has hit the lower limit; if so, ONLY flag the value as
+        #   having a MIN_SIGMA.
+        flg = numpy.any(near_lower_bound[:,indx] & sig_indx[None,indx], axis=2)
+        if numpy.any(flg):
+            eml_mask[flg] |= self.bitmask.bit_value('MIN_SIGMA')
+
+        # - Determine if any of the kinematic parameters are near the
+        #   bound (excluding the lower velocity dispersion limit)
+        flg = numpy.any((near_lower_bound[:,indx] & numpy.invert(sig_indx)[None,indx])
+                            | (near_bound[:,indx] & numpy.invert(near_lower_bound[:,indx])),
+                        axis=2)
+        if numpy.any(flg):
+            eml_mask[flg] |= self.bitmask.bit_value('NEAR_BOUND')
+        model_eml_par['MASK'][:,eml] = eml_mask
 
         # Flag the pixels that were not used
-        model_mask[flux.mask] = self.bitmask.turn_on(model_mask[flux.mask], flag='DIDNOTUSE')
+        indx = numpy.ma.getmaskarray(flux)
+        model_mask[indx] |= self.bitmask.bit_value('DIDNOTUSE')
 
         # Mask any lines that were not fit
-        model_eml_par['MASK'][:,numpy.invert(self.fit_eml)] \
-                    = self.bitmask.turn_on(model_eml_par['MASK'][:,numpy.invert(self.fit_eml)],
-                                           flag='NO_FIT')
+        model_eml_par['MASK'][:,numpy.invert(self.fit_eml)] |= self.bitmask.bit_value('NO_FIT')
+
+        # Fitted wavelength of each line, used to sample the polynomials
+        obswave = self.emldb['restwave'][eml][None,:] * (1 + z)
 
         #---------------------------------------------------------------
         # Iterate over each spectrum
@@ -1168,12 +1169,6 @@ class Sasuke(EmissionLineFit):
                                         [0.0, 0.68, 0.95, 0.99, 1.0], use_interpolate=False)
 
             if used_apoly or used_mpoly or used_ebv:
-                # Sample the polynomials at the fitted wavelength of
-                # each line
-                obswave = self.emldb['restwave'][self.fit_eml] \
-                                    * (1 + model_eml_par['KIN'][i,self.fit_eml,0]
-                                                / astropy.constants.c.to('km/s').value)
-
                 # - Additive polynomial:
                 if used_apoly:
                     apoly = numpy.polynomial.legendre.legval(poly_x, model_fit_par['ADDCOEF'][i,:])
@@ -1181,7 +1176,7 @@ class Sasuke(EmissionLineFit):
                     model_eml_par['CONTAPLY'][i,:] \
                             = interpolate.interp1d(self.obj_wave[start[i]:end[i]], apoly,
                                                    bounds_error=False, fill_value=0.0,
-                                                   assume_sorted=True)(obswave)
+                                                   assume_sorted=True)(obswave[i])
 
                 # - Multiplicative polynomial:
                 if used_mpoly:
@@ -1191,7 +1186,7 @@ class Sasuke(EmissionLineFit):
                     model_eml_par['CONTMPLY'][i,:] \
                             = interpolate.interp1d(self.obj_wave[start[i]:end[i]], mpoly,
                                                    bounds_error=False, fill_value=1.0,
-                                                   assume_sorted=True)(obswave)
+                                                   assume_sorted=True)(obswave[i])
                 #-------------------------------------------------------
                 # As of version 6.6.5, pPXF no longer applies the
                 # multiplicative polynomial to the gas templates
@@ -1207,37 +1202,34 @@ class Sasuke(EmissionLineFit):
                     model_eml_par['CONTRFIT'][i,:] \
                             = interpolate.interp1d(self.obj_wave, extcurve,
                                                    bounds_error=False, fill_value=1.0,
-                                                   assume_sorted=True)(obswave)
-
-            # Get the instrumental dispersion in the galaxy data at the
-            # location of the fitted lines
-            # TODO: sres has to be provided!
-            model_eml_par['SIGMAINST'][i,self.fit_eml] = \
-                        EmissionLineFit.instrumental_dispersion(self.obj_wave, sres[i,:],
-                                                        self.emldb['restwave'][self.fit_eml],
-                                                        model_eml_par['KIN'][i,self.fit_eml,0])
-
-            # Set the instrumental dispersion of the emission line
-            # templates to the output database
-            model_eml_par['SIGMATPL'][i,self.fit_eml] = etpl.eml_sigma_inst[self.fit_eml]
-
-            # Add the template dispersion into the fitted dispersion to
-            # get the observed dispersion
-            model_eml_par['KINERR'][i,self.fit_eml,1] \
-                        = model_eml_par['KIN'][i,self.fit_eml,1] \
-                            * model_eml_par['KINERR'][i,self.fit_eml,1]
-            model_eml_par['KIN'][i,self.fit_eml,1] \
-                        = numpy.sqrt( numpy.square(model_eml_par['KIN'][i,self.fit_eml,1])
-                                        + numpy.square(model_eml_par['SIGMATPL'][i,self.fit_eml]))
-            model_eml_par['KINERR'][i,self.fit_eml,1] /= model_eml_par['KIN'][i,self.fit_eml,1]
-
-            # With these definitions, the sigma correction is the same
-            # as the instrumental dispersion; see copy function outside
-            # the loop below
-            #-----------------------------------------------------------
-
-        # With the above definitions (starting at line 1274), the
-        # instrumental sigma and the sigma correction are identical
+                                                   assume_sorted=True)(obswave[i])
+
+        # Get the instrumental dispersion in the galaxy data at the
+        # location of the fitted lines
+        # TODO: sres has to be provided!
+        indx = numpy.ix_(spec_to_fit, eml)
+        model_eml_par['SIGMAINST'][indx] \
+                = EmissionLineFit.instrumental_dispersion(self.obj_wave, sres[spec_to_fit,:],
+                                                          self.emldb['restwave'][eml],
+                                                          model_eml_par['KIN'][:,:,0][indx])
+
+        # Set the instrumental dispersion of the emission line templates
+        # to the output database
+        model_eml_par['SIGMATPL'][indx] = etpl.eml_sigma_inst[eml][None,:]
+
+        # Add the template dispersion into the fitted dispersion to get
+        # the observed dispersion.
+        sigma = model_eml_par['KIN'][:,:,1][indx]
+        sigma_err = model_eml_par['KINERR'][:,:,1][indx]
+        numpy.multiply(sigma, sigma_err, out=sigma_err)
+        numpy.square(sigma, out=sigma)
+        sigma += numpy.square(etpl.eml_sigma_inst[eml])[None,:]
+        numpy.sqrt(sigma, out=sigma)
+        sigma_err /= sigma
+        model_eml_par['KIN'][:,:,1][indx] = sigma
+        model_eml_par['KINERR'][:,:,1][indx] = sigma_err
+
+        # With the above definitions, the instrumental sigma and the sigma correction are identical
         model_eml_par['SIGMACORR'] = model_eml_par['SIGMAINST'].copy()
 
         #---------------------------------------------------------------
@@ -1981,7 +1973,7 @@ class Sasuke(EmissionLineFit):
 
         #---------------------------------------------------------------
         # Check any input stellar template spectra
-        R_to_sinst = astropy.constants.c.to('km/s').value / DAPConstants.sig2fwhm
+        R_to_sinst = _c_kms / DAPConstants.sig2fwhm
         if stpl_flux is not None:
             if stpl_wave is None:
                 raise ValueError('Must provide wavelengths if providing stellar template fluxes.')
@@ -2022,8 +2014,7 @@ class Sasuke(EmissionLineFit):
 
         # Get the observed template wavelengths at the expectected
         # redshift of the galaxy spectrum
-        tpl_wave_obs =self.tpl_wave * (1 + numpy.median(self.input_cz)
-                                            / astropy.constants.c.to('km/s').value)
+        tpl_wave_obs =self.tpl_wave * (1 + numpy.median(self.input_cz) / _c_kms)
 
         if self.obj_sres is not None:
             # Set the instrumental resolution of the emission-line
@@ -2060,11 +2051,6 @@ class Sasuke(EmissionLineFit):
         stellar_moments = None if stellar_kinematics is None else stellar_kinematics.shape[1]
         if self.nstpl > 0 and stellar_kinematics is None:
             raise ValueError('Must provide stellar kinematics if refiting stellar templates.')
-        # Convert velocities from cz to pPXF pixelized velocities
-        if self.nstpl > 0:
-            _stellar_kinematics = stellar_kinematics.copy()
-            _stellar_kinematics[:,0], _ = PPXFFit.revert_velocity(stellar_kinematics[:,0],
-                                                                  numpy.zeros(self.nobj))
 
         #---------------------------------------------------------------
         # Build the emission-line templates; the EmissionLineTemplates
@@ -2083,9 +2069,9 @@ class Sasuke(EmissionLineFit):
 
         # Set the component associated with each emission line
         self.fit_eml = self.emldb['action'] == 'f'
-        self.eml_tpli = etpl.tpli.copy()
+        self.eml_tpli = etpl.tpli
         self.eml_compi = numpy.full(self.neml, -1, dtype=int)
-        self.eml_compi[self.fit_eml] = numpy.array([etpl.comp[i] for i in etpl.tpli[self.fit_eml]])
+        self.eml_compi[self.fit_eml] = etpl.comp[etpl.tpli[self.fit_eml]]
 
         #---------------------------------------------------------------
         # Save the basic pPXF parameters
@@ -2108,7 +2094,7 @@ class Sasuke(EmissionLineFit):
         self.constr_kinem = None if not hasattr(etpl, 'A_ineq') or etpl.A_ineq is None \
                                 else {'A_ineq': etpl.A_ineq, 'b_ineq': etpl.b_ineq}
         self.comp_start_kin \
-                = EmissionLineTemplates.fill_guess_kinematics(guess_kin, numpy.amax(etpl.comp)+1,
+                = EmissionLineTemplates.fill_guess_kinematics(guess_kin, etpl.ncomp,
                                                               etpl.tie_comp_lb, etpl.tie_comp_ub,
                                                               etpl.A_ineq)
         if self.nstpl == 0:
@@ -2121,40 +2107,56 @@ class Sasuke(EmissionLineFit):
             self.ncomp = numpy.amax(self.tpl_comp)+1
             self.comp_moments = numpy.array([moments]*self.ncomp)
         else:
-            self.gas_tpl = numpy.append(numpy.zeros(self.tpl_flux.shape[0]),
-                                        numpy.ones(etpl.ntpl)).astype(bool)
-            self.tpl_flux = numpy.append(self.tpl_flux, etpl.flux, axis=0)
-            self.tpl_to_use = numpy.append(self.tpl_to_use,
-                                           numpy.ones((self.nobj,etpl.ntpl), dtype=bool),
-                                           axis=1)
-            self.tpl_comp = numpy.append(numpy.zeros(self.nstpl, dtype=int), etpl.comp+1)
-            self.tpl_vgrp = numpy.append(numpy.zeros(self.nstpl, dtype=int), etpl.vgrp+1)
-            self.tpl_sgrp = numpy.append(numpy.zeros(self.nstpl, dtype=int), etpl.sgrp+1)
+            ntpl = self.nstpl + etpl.ntpl
+            self.gas_tpl = numpy.arange(ntpl) >= self.nstpl
+            self.tpl_flux = numpy.concatenate((self.tpl_flux, etpl.flux), axis=0)
+            # All gas templates are used
+            tpl_to_use = numpy.ones((self.nobj,ntpl), dtype=bool)
+            tpl_to_use[:,:self.nstpl] = self.tpl_to_use
+            self.tpl_to_use = tpl_to_use
+            # The stellar templates are the first component and
+            # kinematic group; offset the gas components and groups
+            self.tpl_comp = numpy.zeros(ntpl, dtype=int)
+            numpy.add(etpl.comp, 1, out=self.tpl_comp[self.nstpl:])
+            self.tpl_vgrp = numpy.zeros(ntpl, dtype=int)
+            numpy.add(etpl.vgrp, 1, out=self.tpl_vgrp[self.nstpl:])
+            self.tpl_sgrp = numpy.zeros(ntpl, dtype=int)
+            numpy.add(etpl.sgrp, 1, out=self.tpl_sgrp[self.nstpl:])
+            self.eml_tpli = self.eml_tpli.copy()
             self.eml_tpli[self.fit_eml] += self.nstpl
             self.eml_compi[self.fit_eml] += 1
             self.ncomp = numpy.amax(self.tpl_comp)+1
             self.comp_moments = numpy.array([-stellar_moments] + [moments]*(self.ncomp-1))
 
-            self.comp_start_kin = numpy.append(numpy.expand_dims(_stellar_kinematics, 0),
-                                               self.comp_start_kin.transpose(1,0,2),
-                                               axis=0).transpose(1,0,2)
+            self.comp_start_kin = numpy.concatenate((stellar_kinematics[:,None,:],
+                                                     self.comp_start_kin), axis=1)
+            # Convert the stellar velocities from cz to pPXF pixelized
+            # velocities
+            self.comp_start_kin[:,0,0] = PPXFFit.revert_velocity(stellar_kinematics[:,0], 0.)[0]
             if self.constr_kinem is not None:
                 self.constr_kinem['A_ineq'] \
                         = numpy.hstack((numpy.zeros((self.constr_kinem['A_ineq'].shape[0], 2),
                                                     dtype=float), self.constr_kinem['A_ineq']))
 
         self.ntpl, self.npix_tpl = self.tpl_flux.shape
-        self.tpl_npad = 2**int(numpy.ceil(numpy.log2(self.npix_tpl)))
-        self.tpl_rfft = numpy.fft.rfft(self.tpl_flux, self.tpl_npad, axis=1)
 
         # Total number of kinematics parameters (tied or otherwise)
         self.npar_kin = numpy.sum(numpy.absolute(self.comp_moments))
 
+        # Parameter tying for the full set of templates
+        self.tied = ppxf_tied_parameters(self.tpl_comp, self.tpl_vgrp, self.tpl_sgrp,
+                                         self.comp_moments)
+        # ... and the index of the parameter each parameter is tied to
+        self.tied_indx = numpy.arange(self.npar_kin)
+        if self.tied is not None:
+            _tied = numpy.concatenate(self.tied)
+            indx = numpy.array([len(t) > 0 for t in _tied])
+            self.tied_indx[indx] = [int(t.split('[')[1].split(']')[0]) for t in _tied[indx]]
+
         # Maximum number of freee kinematic parameters
-        tied = numpy.concatenate(tuple(ppxf_tied_parameters(self.tpl_comp, self.tpl_vgrp,
-                                                            self.tpl_sgrp, self.comp_moments)))
         self.nfree_kin = numpy.sum(self.comp_moments[self.comp_moments > 0]) \
-                            if tied is None else numpy.sum([len(t) == 0 for t in tied]) \
+                            if self.tied is None \
+                            else numpy.sum([len(t) == 0 for t in numpy.concatenate(self.tied)]) \
                             - numpy.sum(self.comp_moments[self.comp_moments < 0]) 
 
         # Get the degrees of freedom (excluding the number of templates)
@@ -2197,16 +2199,14 @@ class Sasuke(EmissionLineFit):
                                                        ensemble=ensemble, loggers=self.loggers,
                                                        quiet=self.quiet)
 
-        ended_in_error = numpy.array([e is not None for e in err])
+        ended_in_error = numpy.fromiter((e is not None for e in err), dtype=bool, count=len(err))
         if numpy.any(ended_in_error):
             if not self.quiet:
                 warnings.warn('Masking failures in some/all spectra.  Errors are: {0}'.format(
                                 numpy.array([(i,e) for i,e in enumerate(err)])[ended_in_error]))
             if self.nremap == 0:
-                model_fit_par['MASK'][ended_in_error] \
-                        = self.bitmask.turn_on(model_fit_par['MASK'][ended_in_error], 'NO_FIT')
-                model_eml_par['MASK'][ended_in_error] \
-                        = self.bitmask.turn_on(model_eml_par['MASK'][ended_in_error], 'NO_FIT')
+                model_fit_par['MASK'][ended_in_error] |= self.bitmask.bit_value('NO_FIT')
+                model_eml_par['MASK'][ended_in_error] |= self.bitmask.bit_value('NO_FIT')
         if numpy.all(ended_in_error):
             if self.nremap == 0:
                 return self.obj_wave, model_flux, model_eml_flux, obj_model_mask, \
@@ -2231,16 +2231,15 @@ class Sasuke(EmissionLineFit):
                                                            alias_window=alias_window,
                                                            ensemble=ensemble, loggers=self.loggers,
                                                            quiet=self.quiet)
-            ended_in_error = numpy.array([e is not None for e in err])
+            ended_in_error = numpy.fromiter((e is not None for e in err), dtype=bool,
+                                            count=len(err))
             if numpy.any(ended_in_error):
                 if not self.quiet:
                     warnings.warn('Masking failures in some/all remapping spectra.  '
                                   'Errors are: {0}'.format(
                                 numpy.array([(i,e) for i,e in enumerate(err)])[ended_in_error]))
-                model_fit_par['MASK'][ended_in_error] \
-                        = self.bitmask.turn_on(model_fit_par['MASK'][ended_in_error], 'NO_FIT')
-                model_eml_par['MASK'][ended_in_error] \
-                        = self.bitmask.turn_on(model_eml_par['MASK'][ended_in_error], 'NO_FIT')
+                model_fit_par['MASK'][ended_in_error] |= self.bitmask.bit_value('NO_FIT')
+                model_eml_par['MASK'][ended_in_error] |= self.bitmask.bit_value('NO_FIT')
             if numpy.all(ended_in_error):
                 return self.obj_wave, model_flux, model_eml_flux, remap_model_mask, \
                             model_fit_par, model_eml_par
@@ -2314,11 +2313,10 @@ class Sasuke(EmissionLineFit):
             tpl_to_use = self.tpl_to_use[bins_to_fit]
             comp_start_kin = self.comp_start_kin[bins_to_fit]
 
-        for i,(s,e) in enumerate(zip(start,end)):
-            if not spec_to_fit[i]:
-                continue
-            model_mask[i,:s] = self.bitmask.turn_on(model_mask[i,:s], 'DIDNOTUSE')
-            model_mask[i,e:] = self.bitmask.turn_on(model_mask[i,e:], 'DIDNOTUSE')
+        # Flag the pixels outside the fitted range of each spectrum
+        pix = numpy.arange(model_mask.shape[1])
+        indx = spec_to_fit[:,None] & ((pix[None,:] < start[:,None]) | (pix[None,:] >= end[:,None]))
+        model_mask[indx] |= self.bitmask.bit_value('DIDNOTUSE')
 
         #---------------------------------------------------------------
         # Report the input/prep checks/results
@@ -2379,20 +2377,21 @@ class Sasuke(EmissionLineFit):
         # When remapid is provided, the binid subset should be identical to
         # nearest_bin!
 
-        # Construct the bin ID numbers
-        model_fit_par['BINID'] = numpy.arange(output_shape[0])
-        model_fit_par['BINID_INDEX'] = numpy.arange(output_shape[0])
+        # Construct the bin ID numbers; here the ID and index are
+        # identical
+        bin_indx = numpy.arange(output_shape[0], dtype=model_fit_par['BINID'].dtype)
+        model_fit_par['BINID'] = bin_indx
+        model_fit_par['BINID_INDEX'] = bin_indx
         model_fit_par['NEAREST_BIN'][spec_to_fit] = nearest_bin
 
-        model_eml_par['BINID'] = numpy.arange(output_shape[0])
-        model_eml_par['BINID_INDEX'] = numpy.arange(output_shape[0])
+        model_eml_par['BINID'] = bin_indx
+        model_eml_par['BINID_INDEX'] = bin_indx
 
         # Flag pixels as rejected during fitting; _model_mask is True
         # where the pixels were fit
-        indx = mask & numpy.invert(_model_mask)
-        _model_mask = model_mask[spec_to_fit]
-        _model_mask[indx] = self.bitmask.turn_on(_model_mask[indx], PPXFFit.rej_flag)
-        model_mask[spec_to_fit] = _model_mask
+        indx = numpy.zeros(model_mask.shape, dtype=bool)
+        indx[spec_to_fit] = mask & numpy.invert(_model_mask)
+        model_mask[indx] |= self.bitmask.bit_value(PPXFFit.rej_flag)
 
         # Flag pixels that weren't in the fitted range
 #        model_mask[spec_to_fit,:start] = self.bitmask.turn_on(model_mask[spec_to_fit,:start],
@@ -2401,17 +2400,15 @@ class Sasuke(EmissionLineFit):
 #                                                            'DIDNOTUSE')
         if not numpy.all(spec_to_fit):
             indx = numpy.invert(spec_to_fit)
-            model_mask[indx,:] = self.bitmask.turn_on(model_mask[indx,:], 'DIDNOTUSE')
+            model_mask[indx,:] |= self.bitmask.bit_value('DIDNOTUSE')
 
         # Flag failed fits
         _fault = numpy.zeros(output_shape[0], dtype=bool)
         _fault[spec_to_fit] = fault
         if numpy.any(_fault):
-            model_fit_par['MASK'][_fault] = self.bitmask.turn_on(model_fit_par['MASK'][_fault],
-                                                                 'FIT_FAILED')
-            model_eml_par['MASK'][_fault] = self.bitmask.turn_on(model_eml_par['MASK'][_fault],
-                                                                 'FIT_FAILED')
-            model_mask[_fault,:] = self.bitmask.turn_on(model_mask[_fault,:], 'FIT_FAILED')
+            model_fit_par['MASK'][_fault] |= self.bitmask.bit_value('FIT_FAILED')
+            model_eml_par['MASK'][_fault] |= self.bitmask.bit_value('FIT_FAILED')
+            model_mask[_fault,:] |= self.bitmask.bit_value('FIT_FAILED')
 
         #---------------------------------------------------------------
         # Save the results
@@ -2477,7 +2474,7 @@ class Sasuke(EmissionLineFit):
         etpl = EmissionLineTemplates(_stpl_wave, numpy.ones(_stpl_wave.shape, dtype=float),
                                      emldb=emission_lines, quiet=True)
         _ntpl = nstpl+etpl.ntpl
-        ngas_comp = numpy.amax(etpl.comp)+1
+        ngas_comp = etpl.ncomp
         
         # Check the shape of the input model parameter database
         if model_fit_par['BINID'].size != nobj:
@@ -2489,9 +2486,9 @@ class Sasuke(EmissionLineFit):
         # wavelength vectors; interpretted by pPXF as a base velocity
         # shift between the two.  For Sasuke, start and end should be
         # the same, but leave it as general.
-        vsyst = numpy.array([ -PPXFFit.ppxf_tpl_obj_voff(_stpl_wave, _obj_wave[s:e], _velscale,
-                                                         velscale_ratio=_velscale_ratio)
-                                for s,e in zip(model_fit_par['BEGPIX'], model_fit_par['ENDPIX'])])
+        vsyst = -PPXFFit.ppxf_tpl_obj_voff(_stpl_wave, _obj_wave, _velscale,
+                                           velscale_ratio=_velscale_ratio,
+                                           start=model_fit_par['BEGPIX'])
 
         # Get the additive and multiplicative degree of the polynomials
         degree = model_fit_par['ADDCOEF'].shape
@@ -15,6 +15,7 @@ Binning!
 .. include:: ../include/links.rst
 """
 import warnings
+from ast import literal_eval
 
 from IPython import embed
 
@@ -178,7 +179,7 @@ class RadialBinningPar(KeywordParSet):
         self['pa'] = hdr['BINPA']
         self['ell'] = hdr['BINELL']
         self['radius_scale'] = hdr['BINSCL']
-        self['radii'] = eval(hdr['BINRAD'])
+        self['radii'] = literal_eval(hdr['BINRAD'])
         self['log_step'] = bool(hdr['BINLGR'])
 
     # TODO: This should actually use the cube metadata, not the rdxqa
@@ -237,14 +238,31 @@ class RadialBinning(SpatialBinning):
 
         # Get the logarithmically stepped values
         if self.par['log_step']:
-            self.rs = numpy.log10(self.par['radii'][0])
-            self.dr = (numpy.log10(self.par['radii'][1]) - self.rs)/self.par['radii'][2]
+            self.rs, log_re = numpy.log10(self.par['radii'][:2])
+            self.dr = (log_re - self.rs)/self.par['radii'][2]
             return
 
         # Get the linearly stepped values
         self.rs = self.par['radii'][0]
         self.dr = (self.par['radii'][1] - self.rs)/self.par['radii'][2]
         
+    def _bin_edges(self):
+        r"""
+        Return the on-sky radii of the bin edges.
+
+        Returns:
+            `numpy.ndarray`_: The :math:`N_{\rm bin}+1` radii of the
+            bin edges in arcsec.
+        """
+        rs, re, nr = self.par['radii'][0], self.par['radii'][1], int(self.par['radii'][2])
+        edges = numpy.empty(nr+1, dtype=float)
+        edges[:-1] = numpy.logspace(numpy.log10(rs), numpy.log10(re), num=nr, endpoint=False) \
+                        if self.par['log_step'] else numpy.linspace(rs, re, num=nr, endpoint=False)
+        edges[-1] = re
+        edges *= self.par['radius_scale']
+        return edges
+
+
     def bin_index(self, x, y, gpm=None, par=None):
         """
         Bin the data and return the indices of the bins.
@@ -296,21 +314,20 @@ class RadialBinning(SpatialBinning):
 
         # Get the starting radius and step per bin
         r /= self.par['radius_scale']
-        indx = r >= 0.0
-        if self.par['log_step']:
-            indx = r > 0
-        self._r_start_step(r[indx])
+        self._r_start_step(r)
 
-        # Determine the bin indices
+        # Determine the bin indices.  For logarithmic steps, spectra at
+        # R=0 have log(R) = -inf and fall below the first bin.
         if self.par['log_step']:
-            r[indx] = numpy.log10(r[indx])
+            with numpy.errstate(divide='ignore'):
+                numpy.log10(r, out=r)
 
-        binid = numpy.floor((r - self.rs)/self.dr).astype(int)
-        if self.to_center:
-            binid[(binid<0) & indx] = 0          # Go all the way to R=0
-        else:
-            binid[r<self.rs] = -1            # or not
-        binid[binid >= int(self.par['radii'][2])] = -1  # Remove any points outside the last bin
+        # Spectra inside the first bin are either included in it (go all
+        # the way to R=0) or not, and any spectra outside the last bin are
+        # removed.
+        binid = numpy.floor((r - self.rs)/self.dr)
+        binid = numpy.where(binid < int(self.par['radii'][2]),
+                            numpy.maximum(binid, 0 if self.to_center else -1), -1).astype(int)
 
         if gpm is not None:
             # Remove any masked pixels
@@ -333,17 +350,7 @@ class RadialBinning(SpatialBinning):
         """
         if self.par is None:
             raise ValueError('Required parameters not defined.')
-
-        rs = self.par['radii'][0]
-        re = self.par['radii'][1]
-        nr = int(self.par['radii'][2])
-        bin_radii = numpy.append(
-                        numpy.logspace(numpy.log10(rs), numpy.log10(re), num=nr, endpoint=False) \
-                        if self.par['log_step'] \
-                        else numpy.linspace(rs, re, num=nr, endpoint=False), re) \
-                                * self.par['radius_scale']
-
-        return numpy.pi*(1.0-self.par['ell'])*numpy.diff(numpy.square(bin_radii))
+        return numpy.pi*(1.0-self.par['ell'])*numpy.diff(numpy.square(self._bin_edges()))
 # ----------------------------------------------------------------------
 
 
@@ -482,7 +489,12 @@ class VoronoiBinning(SpatialBinning):
         """
         Calculate the S/N using a full covariance matrix.
 
-        The method uses the internal :attr:`covar`.
+        The method uses the internal :attr:`covar`, which is kept as a
+        `scipy.sparse.csr_matrix`_ built once by :func:`bin_index`.  The
+        covariance of the bin is extracted by selecting the rows and
+        then the columns of the sparse matrix, such that the cost of
+        each call scales with the number of non-zero elements in the
+        bin instead of with the square of the number of spaxels.
 
         Args:
             index (`numpy.ndarray`_):
@@ -498,7 +510,7 @@ class VoronoiBinning(SpatialBinning):
             any covariance.
         """
         _index = numpy.atleast_1d(index)
-        return numpy.sum(signal[index])/numpy.sqrt(numpy.sum(self.covar[_index,:][:,_index]))
+        return numpy.sum(signal[index])/numpy.sqrt(self.covar[_index][:,_index].sum())
 
     def sn_calculation_calibrate_noise(self, index, signal, noise):
         r"""
@@ -580,10 +592,16 @@ class VoronoiBinning(SpatialBinning):
         if self.par['signal'].size != x.size:
             raise ValueError('Dimensionality of signal does not match on-sky coordinates.')
 
-        # Construct the covariance input if provided
+        # Construct the covariance input if provided and set the noise
+        # vector accordingly
         self.covar = None
         sn_func = self.sn_calculation_no_covariance
-        if self.par['covar'] is not None:
+        _noise = self.par['noise']
+        if isinstance(self.par['covar'], (float, numpy.floating)):
+            # Calibrate the nominal noise for the effects of covariance
+            self.covar = self.par['covar']
+            sn_func = self.sn_calculation_calibrate_noise
+        elif self.par['covar'] is not None:
             if isinstance(self.par['covar'], Covariance):
                 # Check dimensionality
                 if self.par['covar'].dim == 3:
@@ -591,30 +609,24 @@ class VoronoiBinning(SpatialBinning):
                 # Make sure the object is a full covariance matrix
                 if self.par['covar'].is_correlation:
                     self.par['covar'].revert_correlation()
-            # Fill the full array if necessary
-            if not isinstance(self.par['covar'], (numpy.ndarray,float)):
-                self.covar = self.par['covar'].toarray()
-                sn_func = self.sn_calculation_covariance_matrix
+                self.covar = self.par['covar'].full().tocsr()
             else:
-                self.covar = self.par['covar']
-                sn_func = self.sn_calculation_calibrate_noise
-
-            if isinstance(self.covar, numpy.ndarray):
-                # Check that the size matches the input signal array
-                if self.covar.shape[0] != self.par['signal'].size:
-                    raise ValueError('Dimensionality of covariance does not match signal.')
-                _noise = numpy.sqrt(numpy.diag(self.covar))
+                self.covar = sparse.csr_matrix(self.par['covar'])
+            # Check that the size matches the input signal array
+            if self.covar.shape[0] != self.par['signal'].size:
+                raise ValueError('Dimensionality of covariance does not match signal.')
+            # Keep the full covariance matrix in sparse form and take the
+            # noise from its diagonal
+            _noise = numpy.sqrt(self.covar.diagonal())
+            sn_func = self.sn_calculation_covariance_matrix
 
         # Make sure the noise vector is available
-        if self.covar is None or isinstance(self.covar, float):
-            _noise = self.par['noise']
         if _noise is None:
             raise ValueError('Could not construct noise measurements for Voronoi binning.')
         if _noise.size != self.par['signal'].size:
             raise ValueError('Dimensionality of noise does not match signal.')
 
         # Down-select to the valid spaxels
-        revert_covar = False
         if gpm is None:
             _x = x
             _y = y
@@ -624,10 +636,21 @@ class VoronoiBinning(SpatialBinning):
             _y = y[gpm]
             _signal = self.par['signal'][gpm]
             _noise = _noise[gpm]
-            if self.covar is not None and isinstance(self.covar, numpy.ndarray):
-                revert_covar = True
-                _covar = self.covar.copy()
-                self.covar = self.covar[gpm,:][:,gpm]
+            if isinstance(self.covar, sparse.spmatrix):
+                # Cache the CSR matrix for the selected spaxels; this is
+                # sliced by sn_calculation_covariance_matrix for every
+                # trial bin
+                self.covar = self.covar[gpm,:][:,gpm].tocsr()
+
+        # The positions are typically strided columns of a FITS table and
+        # the signal and noise can be in big-endian byte order.  Convert
+        # them once to contiguous, native double-precision arrays so that
+        # the many S/N calculations performed during the binning do not
+        # have to.
+        _x = numpy.ascontiguousarray(_x, dtype=float)
+        _y = numpy.ascontiguousarray(_y, dtype=float)
+        _signal = numpy.ascontiguousarray(_signal, dtype=float)
+        _noise = numpy.ascontiguousarray(_noise, dtype=float)
 
         # All spaxels have S/N greater than threshold, so return each
         # spaxel in its own "bin"
@@ -29,9 +29,6 @@ from ..util.filter import interpolate_masked_vector
 from ..par.emissionlinedb import EmissionLineDB
 from .bandpassfilter import emission_line_equivalent_width, passband_median
 
-# For debugging
-from matplotlib import pyplot
-
 
 # BASE CLASS -----------------------------------------------------------
 class SpectralFitting:
@@ -539,50 +536,65 @@ class EmissionLineFit(SpectralFitting):
         Determine the instrumental dispersion for a set of rest
         wavelengths and velocities.
 
+        The spectral resolution is linearly interpolated (and
+        extrapolated) to the observed wavelength of each line.  If
+        ``sres`` is 2D, the dispersions are computed for all spectra
+        at once.
+
         Args:
 
             wave (numpy.ndarray): Vector with the wavelengths of the
                 spectrum.
 
             sres (numpy.ndarray): Vector with the spectral resolution as
-                a function of wavelength.
+                a function of wavelength, or a 2D array with the
+                resolution vectors of many spectra, with shape
+                ``(nspec,nwave)``.
 
             restwave (float, numpy.ndarray): Rest wavelengths for a set
                 of measured lines.
 
             cz (float, numpy.ndarray): Redshifts (in km/s) of each or
-                all lines.
+                all lines.  If ``sres`` is 2D, this must broadcast to
+                shape ``(nspec,nline)``.
 
         Returns:
             numpy.ndarray : The instrumental dispersions for each
-                provided line.
+                provided line.  If ``sres`` is 2D, the shape is
+                ``(nspec,nline)``.
         """
         # Check input
         if len(wave.shape) != 1:
             raise ValueError('Input wavelength must be a 1D vector.')
-        if wave.shape != sres.shape:
+        if sres.ndim not in [1, 2] or sres.shape[-1] != wave.size:
             raise ValueError('Input wavelength and resolution vectors must have the same shape.')
         
         nwave = wave.size
         _restwave = numpy.atleast_1d(restwave)
         nline = _restwave.size
         _cz = numpy.atleast_1d(cz)
-        if _cz.size not in [ 1, nline ]:
+        if sres.ndim == 1 and _cz.size not in [ 1, nline ]:
             raise ValueError('Must provide single redshift or one redshift per line.')
-        _cz = numpy.full(nline, cz, dtype=float) if _cz.size == 1 else _cz
 
-        interpolator = interp1d(wave, sres, fill_value='extrapolate', assume_sorted=True)
         c = astropy.constants.c.to('km/s').value
-
-        sinst = c / interpolator((cz/c + 1.0) * restwave)/DAPConstants.sig2fwhm
-
-#        pyplot.plot(wave, c/sres/DAPConstants.sig2fwhm, lw=2)
-#        pyplot.plot(wave, 2.5*astropy.constants.c.to('km/s').value/wave/DAPConstants.sig2fwhm,
-#                    color='k', lw=1)
-#        pyplot.scatter((cz/c + 1.0) * restwave, sinst, color='C1', marker='.', lw=0, s=100)
-#        pyplot.show()
-
-        return c / interpolator((cz/c + 1.0) * restwave)/DAPConstants.sig2fwhm
+        obswave = (cz/c + 1.0) * restwave
+        if sres.ndim == 2:
+            obswave = numpy.broadcast_to(obswave, (sres.shape[0], nline))
+
+        # Linearly interpolate the resolution to the observed
+        # wavelengths, extrapolating beyond the edges using the first
+        # or last wavelength interval (cf. scipy.interpolate.interp1d)
+        hi = numpy.clip(numpy.searchsorted(wave, obswave), 1, nwave-1)
+        lo = hi - 1
+        if sres.ndim == 2:
+            row = numpy.arange(sres.shape[0])[:,None]
+            sres_lo = sres[row,lo]
+            sres_hi = sres[row,hi]
+        else:
+            sres_lo = sres[lo]
+            sres_hi = sres[hi]
+        slope = (sres_hi - sres_lo) / (wave[hi] - wave[lo])
+        return c / (slope*(obswave - wave[lo]) + sres_lo) / DAPConstants.sig2fwhm
 
     # NOTE: This is here because these constraints on the emission-line database
     # are only relevant if it is being used to specify the lines to fit to a
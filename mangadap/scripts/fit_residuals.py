@@ -20,7 +20,7 @@ from mangadap.proc.util import growth_lim, inverse
 from mangadap.config.analysisplan import AnalysisPlan
 from mangadap.util.filter import BoxcarFilter
 from mangadap.util.sampling import spectral_coordinate_step
-from mangadap.util.mapping import map_extent, map_beam_patch
+from mangadap.util.mapping import map_extent, map_beam_patch, masked_imshow
 from mangadap.util.fileio import channel_dictionary
 from mangadap.util.pkg import load_object
 
@@ -47,26 +47,6 @@ def init_image_ax(fig, pos):
     return ax
 
 
-def masked_imshow(fig, ax, cax, data, extent=None, norm=None, vmin=None, vmax=None, cmap='viridis',
-                  zorder=0, cbformat=None, subs=None):
-    if numpy.sum(data.mask) != numpy.prod(data.shape):
-        if norm is None:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            vmin=vmin, vmax=vmax, cmap=cmap, zorder=zorder)
-        else:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            norm=norm, cmap=cmap, zorder=zorder)
-
-        cb = fig.colorbar(img, cax=cax) if cbformat is None else \
-                    fig.colorbar(img, cax=cax, format=cbformat)
-        if subs is not None:
-            cb.locator = ticker.LogLocator(base=10, subs=(1.,2.,4.,))
-            cb.update_ticks()
-    else:
-        _norm = colors.Normalize(vmin=vmin, vmax=vmax) if norm is None else norm
-        cb = colorbar.ColorbarBase(cax, cmap=cm.get_cmap(cmap), norm=_norm)
-
-
 # TODO: Should make this a datacube member function
 def gmr_data(cube, min_frac=0.8):
     """
@@ -17,7 +17,7 @@ from mangadap.proc.spatiallybinnedspectra import SpatiallyBinnedSpectraDef
 from mangadap.proc.stellarcontinuummodel import StellarContinuumModel, StellarContinuumModelDef
 from mangadap.proc.util import growth_lim
 from mangadap.util.fitsutil import DAPFitsUtil
-from mangadap.util.mapping import map_extent, map_beam_patch
+from mangadap.util.mapping import map_extent, map_beam_patch, masked_imshow
 from mangadap.util.pkg import load_object
 from mangadap.config import defaults
 from mangadap import dapfits
@@ -109,25 +109,6 @@ def stellar_continuum_scatter(plt, ifu, daptype, binid, snr, r68, r99, rchi2,
     exit()
     
 
-def masked_imshow(fig, ax, cax, data, extent=None, norm=None, vmin=None, vmax=None, cmap='viridis',
-                  zorder=0, cbformat=None, subs=None):
-    if numpy.sum(data.mask) != numpy.prod(data.shape):
-        if norm is None:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            vmin=vmin, vmax=vmax, cmap=cmap, zorder=zorder)
-        else:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            norm=norm, cmap=cmap, zorder=zorder)
-
-        cb = fig.colorbar(img, cax=cax) if cbformat is None else \
-                    fig.colorbar(img, cax=cax, format=cbformat)
-        if subs is not None:
-            cb.locator = ticker.LogLocator(base=10, subs=(1.,2.,4.,))
-            cb.update_ticks()
-    else:
-        _norm = colors.Normalize(vmin=vmin, vmax=vmax) if norm is None else norm
-        cb = colorbar.ColorbarBase(cax, cmap=cm.get_cmap(cmap), norm=_norm)
-
 # TODO:
 #   - Add a buffer keyword that increases the size of the image panels
 #   - Use astropy image plotting (with wcs) tools instead?
@@ -13,7 +13,7 @@ from mangadap.datacube import DataCube
 from mangadap.config.analysisplan import AnalysisPlan
 from mangadap.util.fileio import channel_dictionary
 from mangadap.proc.util import growth_lim
-from mangadap.util.mapping import map_extent, map_beam_patch
+from mangadap.util.mapping import map_extent, map_beam_patch, masked_imshow
 from mangadap.util.pkg import load_object
 
 from mangadap.scripts import scriptbase
@@ -29,38 +29,6 @@ def init_ax(fig, pos):
     return ax
 
 
-def masked_imshow(fig, ax, cax, data, extent=None, norm=None, vmin=None, vmax=None, cmap='viridis',
-                  zorder=0, cbformat=None, subs=None, orientation='vertical', contour_data=None,
-                  levels=None, cblocator=None, cbticks=None):
-    if numpy.sum(data.mask) != numpy.prod(data.shape):
-        if norm is None:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            vmin=vmin, vmax=vmax, cmap=cmap, zorder=zorder)
-        else:
-            img = ax.imshow(data, origin='lower', interpolation='nearest', extent=extent,
-                            norm=norm, cmap=cmap, zorder=zorder)
-
-        cb = fig.colorbar(img, cax=cax, orientation=orientation) if cbformat is None else \
-                    fig.colorbar(img, cax=cax, format=cbformat, orientation=orientation)
-        if subs is not None:
-            cb.locator = ticker.LogLocator(base=10, subs=(1.,2.,4.,))
-            cb.update_ticks()
-        elif cblocator is not None:
-            cb.locator = cblocator
-            cb.update_ticks()
-        elif cbticks is not None:
-            cb.set_ticks(cbticks)
-            cb.update_ticks()
-    else:
-        _norm = colors.Normalize(vmin=vmin, vmax=vmax) if norm is None else norm
-        cb = colorbar.ColorbarBase(cax, cmap=cm.get_cmap(cmap), norm=_norm)
-
-    if contour_data is not None and levels is not None \
-            and numpy.sum(contour_data.mask) != numpy.prod(contour_data.shape):
-        cnt = ax.contour(contour_data, origin='lower', extent=extent, colors='0.5',
-                         levels=levels, linewidths=1.5, zorder=5)
-
-
 # Test images:
 #  - SPX_MFLUX, SPX_SNR, BINID, BIN_SNR
 #  - STELLAR_CONT_FRESID, STELLAR_CONT_CHI2, STELLAR_VEL, STELLAR_SIGMA
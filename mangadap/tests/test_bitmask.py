@@ -73,6 +73,13 @@ def test_flagging():
     assert numpy.sum(c_indx) == numpy.sum(cosmics_indx)
     assert numpy.sum(s_indx) == 0
 
+    # In-place flagging gives the same result as turn_on
+    _mask = mask.copy()
+    _mask[saturated_indx] |= image_bm.bit_value('SATURATED')
+    mask[saturated_indx] = image_bm.turn_on(mask[saturated_indx], 'SATURATED')
+    assert numpy.array_equal(_mask, mask)
+    assert image_bm.bit_value(['BPM', 'SATURATED']) == 5
+
 
 def test_hdr_io():
     
@@ -29,6 +29,7 @@ def test_tied():
     etpl = EmissionLineTemplates(wave, velscale, emldb=emldb)
 
     assert etpl.ntpl == 4, 'Should be 4 templates'
+    assert (etpl.ncomp, etpl.nvgrp, etpl.nsgrp) == (4, 1, 4), 'Incorrect number of groups'
     assert numpy.array_equal(etpl.comp, numpy.arange(etpl.ntpl)), \
             'Each template should be its own kinematic component'
     assert numpy.array_equal(etpl.vgrp, numpy.zeros(etpl.ntpl)), 'All velocities should be tied'
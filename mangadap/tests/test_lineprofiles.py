@@ -8,7 +8,7 @@ from matplotlib import pyplot
 import astropy.constants
 
 from mangadap.util.sampling import spectrum_velocity_scale, spectral_coordinate_step
-from mangadap.util.lineprofiles import FFTGaussianLSF
+from mangadap.util.lineprofiles import GaussianLSF, IntegratedGaussianLSF, FFTGaussianLSF
 from mangadap.proc import ppxffit
 
 
@@ -175,3 +175,15 @@ def test_line_profile():
             'Model calculation and direct analytic FFT profiles are too different'
 
 
+def test_vector_par():
+    pix = numpy.arange(200)
+    flux = numpy.array([1., 2., 0.5])
+    cen = numpy.array([50.3, 120.7, 250.])
+    sig = numpy.array([1.2, 3.5, 2.])
+    for profile in [GaussianLSF(), IntegratedGaussianLSF(), FFTGaussianLSF()]:
+        lines = profile(pix, profile.parameters_from_moments(flux, cen, sig))
+        assert lines.shape == (flux.size, pix.size), 'Bad shape for vectorized profiles'
+        for i in range(flux.size):
+            assert numpy.allclose(lines[i], profile(pix, [flux[i], cen[i], sig[i]])), \
+                    'Vectorized profile does not match single-line calculation'
+    assert numpy.all(lines[2] == 0), 'Line outside the sampled range should be zero'
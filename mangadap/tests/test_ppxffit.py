@@ -114,3 +114,20 @@ def test_ppxffit():
                         numpy.array([0.067, 0.037, 0.068, 0.046, 0.093, 0.000, 0.029, 0.027]))
                      < 0.001), 'Median absolute residual too different'
 
+
+
+def test_template_subset():
+    rng = numpy.random.default_rng(11)
+    tpl_flux = rng.normal(size=(5,20))
+    tpl_rfft = numpy.fft.rfft(tpl_flux, 32, axis=1)
+    tpl_to_use = numpy.array([[True, False, True, True, False],
+                              [True, False, True, True, False],
+                              [False, True, True, False, True]])
+    cache = {}
+    subsets = [PPXFFit._template_subset(tpl_flux, tpl_rfft, u, cache, maxsize=1)
+                    for u in tpl_to_use]
+    assert len(cache) == 1, 'Cache should be limited to one subset'
+    assert subsets[0] is subsets[1], 'Identical rows should share the cached subset'
+    for u, (f, r) in zip(tpl_to_use, subsets):
+        assert numpy.array_equal(f, tpl_flux[u].T), 'Bad template flux subset'
+        assert numpy.array_equal(r, tpl_rfft[u].T), 'Bad template FFT subset'
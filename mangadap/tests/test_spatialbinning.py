@@ -0,0 +1,67 @@
+import numpy
+from scipy import sparse
+
+from mangadap.proc.spatialbinning import RadialBinning, RadialBinningPar
+from mangadap.proc.spatialbinning import VoronoiBinning, VoronoiBinningPar
+from mangadap.util.covariance import Covariance
+
+
+def spaxel_grid():
+    """Return the flattened coordinates of a 21x21 grid with 0.5 spacing."""
+    return tuple(map(numpy.ravel, numpy.meshgrid(numpy.arange(-5., 5.5, 0.5),
+                                                 numpy.arange(-5., 5.5, 0.5))))
+
+
+def test_radial_log_center():
+    x, y = spaxel_grid()
+    center = numpy.where((x == 0) & (y == 0))[0][0]
+
+    # Inner-most bin extends to R=0
+    par = RadialBinningPar(center=[0.,0.], pa=30., ell=0.3, radius_scale=1., radii=[-1,-1,5],
+                           log_step=True)
+    binning = RadialBinning()
+    binid = binning.bin_index(x, y, par=par)
+    assert binning.to_center, 'Inner-most bin should extend to the center'
+    assert binid[center] == 0, 'Central spaxel should be in the first bin'
+    assert numpy.array_equal(numpy.unique(binid), numpy.arange(5)), 'Bad bin indices'
+
+    # Inner-most bin does not extend to R=0
+    par = RadialBinningPar(center=[0.,0.], pa=30., ell=0.3, radius_scale=1., radii=[0.5,5.,5],
+                           log_step=True)
+    binning = RadialBinning()
+    binid = binning.bin_index(x, y, par=par)
+    assert not binning.to_center, 'Inner-most bin should not extend to the center'
+    assert binid[center] == -1, 'Central spaxel should not be binned'
+    assert binid.max() == 4, 'Bad number of bins'
+
+
+def test_voronoi_covariance():
+    x, y = spaxel_grid()
+    rng = numpy.random.default_rng(99)
+    signal = rng.uniform(0.5, 3., size=x.size)
+    noise = rng.uniform(0.5, 1.5, size=x.size)
+    gpm = rng.uniform(size=x.size) > 0.1
+
+    # Add covariance between adjacent spaxels
+    covar = sparse.diags([numpy.square(noise), 0.3*noise[1:]*noise[:-1]], [0,1]).tocsr()
+
+    # Dense and sparse input yield the same bins
+    binid = VoronoiBinning().bin_index(x, y, gpm=gpm,
+                par=VoronoiBinningPar(target_snr=5., signal=signal,
+                                      covar=Covariance(inp=covar)))
+    assert numpy.all(binid[numpy.logical_not(gpm)] == -1), 'Masked spaxels should not be binned'
+    assert binid.max() > 0, 'Should have more than one bin'
+    _binid = VoronoiBinning().bin_index(x, y, gpm=gpm,
+                par=VoronoiBinningPar(target_snr=5., signal=signal,
+                                      covar=(covar + sparse.triu(covar, k=1).T).toarray()))
+    assert numpy.array_equal(binid, _binid), 'Bins should not depend on covariance input type'
+
+
+def test_radial_area():
+    for log_step in [True, False]:
+        par = RadialBinningPar(center=[0.,0.], pa=30., ell=0.3, radius_scale=2.,
+                               radii=[0.5,5.,5], log_step=log_step)
+        edges = 2*(numpy.geomspace(0.5, 5., 6) if log_step else numpy.linspace(0.5, 5., 6))
+        # The area does not require the bins to have been constructed first
+        area = RadialBinning(par=par).bin_area()
+        assert numpy.allclose(area, numpy.pi*0.7*numpy.diff(edges**2)), 'Bad bin area'
@@ -0,0 +1,43 @@
+import numpy
+from scipy import interpolate
+import astropy.constants
+
+from mangadap.util.constants import DAPConstants
+from mangadap.proc.spectralfitting import EmissionLineFit
+
+
+def interp1d_dispersion(wave, sres, obswave):
+    c = astropy.constants.c.to('km/s').value
+    return c / interpolate.interp1d(wave, sres, fill_value='extrapolate')(obswave) \
+                / DAPConstants.sig2fwhm
+
+
+def test_instrumental_dispersion():
+    wave = numpy.geomspace(3600., 10300., 200)
+    rng = numpy.random.default_rng(5)
+    sres = 2000. + 1500.*(wave - wave[0])/(wave[-1] - wave[0]) + rng.normal(scale=50., size=200)
+
+    # Lines below the first wavelength, above the last wavelength, exactly
+    # on grid points (including both ends), and between grid points
+    restwave = numpy.array([3000., 11000., wave[0], wave[57], wave[-1], 5000., 6564.])
+
+    # Single spectrum with no redshift, such that the observed and rest
+    # wavelengths are identical
+    disp = EmissionLineFit.instrumental_dispersion(wave, sres, restwave, 0.)
+    assert numpy.allclose(disp, interp1d_dispersion(wave, sres, restwave), rtol=1e-12, atol=0.), \
+            'Dispersions do not match interp1d'
+
+    # Many spectra with different redshifts
+    nspec = 4
+    sres2d = sres[None,:] * rng.uniform(0.9, 1.1, size=(nspec,1))
+    cz = numpy.array([0., 3000., -3000., 9000.])[:,None]
+    disp = EmissionLineFit.instrumental_dispersion(wave, sres2d, restwave[None,:], cz)
+    assert disp.shape == (nspec, restwave.size), 'Bad output shape'
+    c = astropy.constants.c.to('km/s').value
+    for i in range(nspec):
+        _disp = interp1d_dispersion(wave, sres2d[i], (cz[i]/c + 1.0) * restwave)
+        assert numpy.allclose(disp[i], _disp, rtol=1e-12, atol=0.), \
+                'Dispersions do not match interp1d'
+        assert numpy.allclose(disp[i], EmissionLineFit.instrumental_dispersion(wave, sres2d[i],
+                                                                               restwave, cz[i,0]),
+                              rtol=0., atol=0.), '1D and 2D calculations do not match'
@@ -432,6 +432,27 @@ class BitMask:
             out ^= (1 << self.bits[_flag[i]])
         return out
 
+    def bit_value(self, flag):
+        """
+        Return the bitmask value with only the selected bit(s) turned on.
+
+        This is useful for turning on bits in place; e.g.,
+        ``mask[indx] |= bm.bit_value('BPM')`` is the same as
+        ``mask[indx] = bm.turn_on(mask[indx], 'BPM')``.
+
+        Args:
+            flag (str, array-like):
+                Bit name(s) to turn on.
+
+        Returns:
+            int: Bitmask value with the selected bit(s) turned on.
+
+        Raises:
+            ValueError:
+                Raised if the provided flag is None.
+        """
+        return self.turn_on(0, flag)
+
     def turn_on(self, value, flag):
         """
         Ensure that a bit is turned on in the provided bitmask value.
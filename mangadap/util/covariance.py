@@ -136,7 +136,6 @@ from IPython import embed
 
 from scipy import sparse
 from astropy.io import fits
-from matplotlib import pyplot
 
 # TODO: Can I avoid using DAPFitsUtil here?
 from .fitsutil import DAPFitsUtil
@@ -931,6 +930,8 @@ class Covariance:
                 If provided, the array is output to this file instead
                 of being plotted to the screen.
         """
+        from matplotlib import pyplot
+
         # Convert the covariance matrix to an array
         a = self.toarray(channel)
 
@@ -18,10 +18,6 @@ from IPython import embed
 import numpy
 from scipy import interpolate, sparse
 
-# Debug
-from matplotlib import pyplot
-from matplotlib.ticker import NullFormatter
-
 def high_pass_filter(flux, dw=0, k=None, Dw=None):
     """
     Pulled from FIREFLY's hpf() function and edited on 17 Nov 2016.
@@ -250,10 +246,11 @@ class BoxcarFilter():
                                              dtype=int)[:,::2]
         self.smoothed_wgt = numpy.add.reduceat(self.input_wgt, self.rdx_index, axis=1,
                                              dtype=float)[:,::2]
-        self.smoothed_y = numpy.add.reduceat(self.input_wgt*self.y.filled(0.0), self.rdx_index,
-                                             axis=1, dtype=float)[:,::2]
-        smoothed_y2 = numpy.add.reduceat(self.input_wgt*numpy.square(self.y.filled(0.0)),
-                                         self.rdx_index, axis=1, dtype=float)[:,::2]
+        y = self.y.filled(0.0)
+        self.smoothed_y = numpy.add.reduceat(self.input_wgt*y, self.rdx_index, axis=1,
+                                             dtype=float)[:,::2]
+        smoothed_y2 = numpy.add.reduceat(self.input_wgt*numpy.square(y), self.rdx_index, axis=1,
+                                         dtype=float)[:,::2]
 
         self.smoothed_y = numpy.ma.divide(self.smoothed_y, self.smoothed_wgt)
         self.smoothed_y[self.output_mask | (self.smoothed_n == 0)] = numpy.ma.masked
@@ -273,6 +270,10 @@ class BoxcarFilter():
 
         return
 
+        # Debug
+        from matplotlib import pyplot
+        from matplotlib.ticker import NullFormatter
+
         w,h = pyplot.figaspect(1)
         fig = pyplot.figure(figsize=(1.5*w,1.5*h))
 
@@ -410,12 +411,13 @@ class BoxcarFilter():
         i=0
         while i > -1:
             nbad = numpy.sum(self.output_mask)
+            resid = self.y.data - self.smoothed_y
             if self.lo_rej is not None:
-                self.output_mask = numpy.logical_or(self.output_mask, self.y.data - self.smoothed_y
-                                                        < (-self.lo_rej*self.sigma_y))
+                self.output_mask = numpy.logical_or(self.output_mask,
+                                                    resid < (-self.lo_rej*self.sigma_y))
             if self.hi_rej is not None:
-                self.output_mask = numpy.logical_or(self.output_mask, self.y.data - self.smoothed_y
-                                                        > (self.hi_rej*self.sigma_y))
+                self.output_mask = numpy.logical_or(self.output_mask,
+                                                    resid > (self.hi_rej*self.sigma_y))
             self.y[self.output_mask] = numpy.ma.masked
             self._apply()
 
@@ -560,11 +560,14 @@ class SemiMajorAxisCoo:
         _y = numpy.atleast_1d(y)
         if _x.size != _y.size:
             raise ValueError('X and Y arrays must have the same size')
-        out = numpy.empty((_x.size, 6), dtype=float)
-        for i, (xx, yy) in enumerate(zip(_x.ravel(),_y.ravel())):
-            self._setB(xx,yy)
-            out[i,:] = linalg.lu_solve((self.Alu, self.Apiv), self.B)
-        return out.reshape(_x.shape + (6,))
+        # Solve for all positions at once; each column is a separate
+        # b vector (see _setB)
+        b = numpy.zeros((6, _x.size), dtype=float)
+        b[0] = _x.ravel()
+        b[1] = _y.ravel()
+        b[2] = -self.xc
+        b[3] = -self.yc
+        return linalg.lu_solve((self.Alu, self.Apiv), b).T.reshape(_x.shape + (6,))
 
 
     def solve_inverse(self, x, y):
@@ -592,11 +595,14 @@ class SemiMajorAxisCoo:
         _y = numpy.atleast_1d(y)
         if _x.size != _y.size:
             raise ValueError('X and Y arrays must have the same size')
-        out = numpy.empty((_x.size, 4), dtype=float)
-        for i, (xx, yy) in enumerate(zip(_x.ravel(),_y.ravel())):
-            self._setD(xx,yy)
-            out[i,:] = linalg.lu_solve((self.Clu, self.Cpiv), self.D)
-        return out.reshape(_x.shape + (4,))
+        # Solve for all positions at once; each column is a separate
+        # d vector (see _setD)
+        d = numpy.empty((4, _x.size), dtype=float)
+        d[0] = -self.xc
+        d[1] = -self.yc
+        d[2] = _x.ravel()
+        d[3] = (1-self.ell)*_y.ravel()
+        return linalg.lu_solve((self.Clu, self.Cpiv), d).T.reshape(_x.shape + (4,))
 
 
     def coo(self, x, y):
@@ -199,6 +199,17 @@ class GaussianLSF:
         self.p = numpy.asarray(p)
 
 
+    def _broadcast_par(self):
+        """
+        Return the parameters reshaped so that they broadcast against
+        the independent variable.  If each parameter is a vector with
+        :math:`N_{\rm line}` elements, the sampled profiles have shape
+        :math:`(N_{\rm line}, N_x)`; otherwise, they have shape
+        :math:`(N_x,)`.
+        """
+        return tuple(numpy.asarray(_p)[...,None] for _p in self.p)
+
+
     def sample(self, x):
         """
         Sample the profile.
@@ -206,8 +217,8 @@ class GaussianLSF:
         Args:
             x (array-like): Independent variable.
         """
-        return self.p[0] * numpy.exp(-numpy.square((x-self.p[1])/self.p[2])/2.) \
-                    / numpy.sqrt(2.0*numpy.pi) / self.p[2]
+        f, mu, sig = self._broadcast_par()
+        return f * numpy.exp(-numpy.square((x-mu)/sig)/2.) / numpy.sqrt(2.0*numpy.pi) / sig
 
 
     def parameters_from_moments(self, mom0, mom1, mom2):
@@ -265,9 +276,10 @@ class IntegratedGaussianLSF(GaussianLSF):
         Args:
             x (array-like): Independent variable.
         """
-        n = numpy.sqrt(2.)*self.p[2]
-        d = numpy.asarray(x)-self.p[1]
-        return self.p[0] * (special.erf((d+self.dx/2.)/n) - special.erf((d-self.dx/2.)/n))/2.
+        f, mu, sig = self._broadcast_par()
+        n = numpy.sqrt(2.)*sig
+        d = numpy.asarray(x)-mu
+        return f * (special.erf((d+self.dx/2.)/n) - special.erf((d-self.dx/2.)/n))/2.
 
 
    
@@ -314,18 +326,18 @@ class FFTGaussianLSF(GaussianLSF):
         Args:
             x (array-like): Independent variable.
         """
+        f, mu, sig = self._broadcast_par()
         # Require that the center of the line be within the range of x
-        if self.p[1] < x[0] or self.p[1] > x[-1]:
-            return numpy.zeros_like(x)
-        xsig = self.p[2]/self.dx
-        x0 = (self.p[1]-x[0])/self.dx
+        inrange = (mu >= x[0]) & (mu <= x[-1])
+        xsig = sig/self.dx
+        x0 = (mu-x[0])/self.dx
         npad = 2**int(numpy.ceil(numpy.log2(x.size)))
 #        npad = fftpack.next_fast_len(x.size)
         w = numpy.linspace(0,numpy.pi,npad//2+1)
-        rfft = self.p[0]*numpy.exp(-0.5*numpy.square(w*xsig) - 1j*w*x0)
+        rfft = numpy.where(inrange, f, 0.)*numpy.exp(-0.5*numpy.square(w*xsig) - 1j*w*x0)
         if self.pixel:
             rfft *= numpy.sinc(w/(2*numpy.pi))
-        lsf = numpy.fft.irfft(rfft, n=npad)[:x.size]
+        lsf = numpy.fft.irfft(rfft, n=npad, axis=-1)[...,:x.size]
         return lsf if self.pixel else lsf/self.dx
 
 
@@ -22,7 +22,7 @@ from scipy import ndimage
 
 from astropy.wcs import WCS
 
-from matplotlib import pyplot, patches
+from matplotlib import pyplot, patches, ticker, colors, colorbar, cm
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from matplotlib.ticker import MaxNLocator
 
@@ -471,6 +471,84 @@ def map_beam_patch(extent, ax, fwhm=2.5, pos=(0.1,0.1), **kwargs):
     return patches.Circle(pos, fwhm/width/2, transform=ax.transAxes, **kwargs)
 
 
+def masked_imshow(fig, ax, cax, data, extent=None, norm=None, vmin=None, vmax=None, cmap='viridis',
+                  zorder=0, cbformat=None, subs=None, orientation='vertical', contour_data=None,
+                  levels=None, cblocator=None, cbticks=None):
+    """
+    Plot a masked map and its colorbar.
+
+    If all pixels are masked, only the colorbar is drawn.  Unmasked data
+    are passed to ``imshow`` as a plain array.
+
+    Args:
+        fig (:obj:`matplotlib.figure.Figure`):
+            Figure with the plot.
+        ax (:obj:`matplotlib.axes.Axes`):
+            Axes for the image.
+        cax (:obj:`matplotlib.axes.Axes`):
+            Axes for the colorbar.
+        data (`numpy.ma.MaskedArray`_):
+            Map to plot.
+        extent (array-like, optional):
+            Image extent passed to ``imshow``.
+        norm (:obj:`matplotlib.colors.Normalize`, optional):
+            Color normalization.  If provided, ``vmin`` and ``vmax``
+            are ignored.
+        vmin (:obj:`float`, optional):
+            Lower limit of the color scale.
+        vmax (:obj:`float`, optional):
+            Upper limit of the color scale.
+        cmap (:obj:`str`, optional):
+            Colormap name.
+        zorder (:obj:`int`, optional):
+            Plotting order of the image.
+        cbformat (:obj:`str`, optional):
+            Format for the colorbar tick labels.
+        subs (:obj:`object`, optional):
+            If not None, use a logarithmic tick locator for the
+            colorbar.
+        orientation (:obj:`str`, optional):
+            Colorbar orientation.
+        contour_data (`numpy.ma.MaskedArray`_, optional):
+            Map to overplot as contours.  Requires ``levels``.
+        levels (array-like, optional):
+            Contour levels.
+        cblocator (:obj:`matplotlib.ticker.Locator`, optional):
+            Colorbar tick locator.  Ignored if ``subs`` is provided.
+        cbticks (array-like, optional):
+            Colorbar tick locations.  Ignored if ``subs`` or
+            ``cblocator`` is provided.
+    """
+    if not numpy.all(data.mask):
+        # Drawing a plain array is faster; only keep the mask if it's used
+        _data = data if numpy.any(data.mask) else data.data
+        if norm is None:
+            img = ax.imshow(_data, origin='lower', interpolation='nearest', extent=extent,
+                            vmin=vmin, vmax=vmax, cmap=cmap, zorder=zorder)
+        else:
+            img = ax.imshow(_data, origin='lower', interpolation='nearest', extent=extent,
+                            norm=norm, cmap=cmap, zorder=zorder)
+
+        cb = fig.colorbar(img, cax=cax, orientation=orientation) if cbformat is None else \
+                    fig.colorbar(img, cax=cax, format=cbformat, orientation=orientation)
+        if subs is not None:
+            cb.locator = ticker.LogLocator(base=10, subs=(1.,2.,4.,))
+            cb.update_ticks()
+        elif cblocator is not None:
+            cb.locator = cblocator
+            cb.update_ticks()
+        elif cbticks is not None:
+            cb.set_ticks(cbticks)
+            cb.update_ticks()
+    else:
+        _norm = colors.Normalize(vmin=vmin, vmax=vmax) if norm is None else norm
+        colorbar.ColorbarBase(cax, cmap=cm.get_cmap(cmap), norm=_norm)
+
+    if contour_data is not None and levels is not None and not numpy.all(contour_data.mask):
+        ax.contour(contour_data, origin='lower', extent=extent, colors='0.5', levels=levels,
+                   linewidths=1.5, zorder=5)
+
+
 
 def permute_wcs_axes(wcs, axes):
     r"""
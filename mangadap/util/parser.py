@@ -20,10 +20,14 @@ Provides a set of parsing utility functions.
 """
 from pathlib import Path
 from os import environ
+from ast import literal_eval
 import warnings
 from IPython import embed
 from configparser import ConfigParser, ExtendedInterpolation
 
+# Translation table used to remove brackets and spaces from list strings
+_list_strip_table = str.maketrans('', '', '[] ')
+
 def arginp_to_list(inp, evaluate=False, quiet=True):
     """
     Separate a list of comma-separated values in the input string to
@@ -34,7 +38,7 @@ def arginp_to_list(inp, evaluate=False, quiet=True):
             Input string with a list of comma-separated values
         evaluate (:obj:`bool`, optional):
             Attempt to evaluate the elements in the list using
-            `eval`_.
+            `ast.literal_eval`_.
         quiet (:obj:`bool`, optional):
             Suppress terminal output.
 
@@ -49,10 +53,7 @@ def arginp_to_list(inp, evaluate=False, quiet=True):
 
     # If the input value is a string, convert it to a list of strings
     if isinstance(out, str):
-        out = out.replace("[", "")
-        out = out.replace("]", "")
-        out = out.replace(" ", "")
-        out = out.split(',')
+        out = out.translate(_list_strip_table).split(',')
 
     # If the input is still not a list, make it one
     if not isinstance(out, list):
@@ -63,8 +64,8 @@ def arginp_to_list(inp, evaluate=False, quiet=True):
         n = len(out)
         for i in range(0,n):
             try:
-                tmp = eval(out[i])
-            except (NameError, TypeError) as e:
+                tmp = literal_eval(out[i])
+            except (ValueError, TypeError) as e:
                 if not quiet:
                     warnings.warn(f'Could not evaluate value {out[i]}. Skipping.')
             else: